@@ -1,11 +1,29 @@
 import sqlite3
-from config.settings import Settings
+from config.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
+
+# Supporting indexes for the staging filter, company rollups, the
+# dashboards' "most recent jobs" query, keyset paging and the per-location
+# counts
+index_commands = """
+-- Covering partial index: stg_jobs aggregates over salary/company/created
+-- are answered from the index alone
+DROP INDEX IF EXISTS idx_rj_salary_max;
+CREATE INDEX IF NOT EXISTS idx_valid_salary ON raw_jobs(salary_max, company, created, id) WHERE salary_max > 1000;
+CREATE INDEX IF NOT EXISTS idx_rj_company_created ON raw_jobs(company, created);
+CREATE INDEX IF NOT EXISTS idx_rj_created_desc ON raw_jobs(created DESC, salary_max);
+CREATE INDEX IF NOT EXISTS idx_rj_location ON raw_jobs(location);
+-- Keyset paging orders on COALESCE(created, '') so undated rows still page
+DROP INDEX IF EXISTS idx_rj_created_id;
+CREATE INDEX IF NOT EXISTS idx_rj_created_key ON raw_jobs(COALESCE(created, ''), id);
+CREATE INDEX IF NOT EXISTS idx_rj_job_date ON raw_jobs(job_posted_date);
+"""
 
 # SQL to create views from existing data
 sql_commands = """
-CREATE VIEW IF NOT EXISTS stg_jobs AS
+DROP VIEW IF EXISTS stg_jobs;
+CREATE VIEW stg_jobs AS
 SELECT 
     id, title, company, location,
     CAST(salary_min AS REAL) as salary_min,
@@ -13,61 +31,472 @@ SELECT
     seniority_level, skills_extracted, is_remote,
     location_city, location_state, location_country,
     search_keyword, search_location,
-    DATE(created) as job_posted_date,
+    job_posted_date,
     DATE(extracted_at) as data_extracted_date
 FROM raw_jobs
 WHERE salary_max > 1000;
+"""
 
-CREATE VIEW IF NOT EXISTS dim_companies AS
-SELECT 
-    company,
-    COUNT(*) as total_jobs_posted,
-    AVG(salary_max) as avg_max_salary,
-    MIN(DATE(created)) as first_job_posted,
-    MAX(DATE(created)) as last_job_posted
-FROM stg_jobs 
+# Companies dimension as a table, maintained like skills_analysis: triggers on
+# raw_jobs write +/- delta rows into companies_mlog for every insert, update
+# and delete, refresh_dim_companies() folds them in. Only jobs with a valid
+# salary and a company count, as in stg_jobs; the dashboard applies the old
+# view's "at least two postings" cut-off when ranking
+companies_sql = """
+CREATE TABLE IF NOT EXISTS dim_companies (
+    company VARCHAR PRIMARY KEY,
+    total_jobs_posted INTEGER NOT NULL DEFAULT 0,
+    salary_sum REAL NOT NULL DEFAULT 0,
+    avg_max_salary REAL GENERATED ALWAYS AS (salary_sum / NULLIF(total_jobs_posted, 0)) VIRTUAL,
+    first_job_posted DATE,
+    last_job_posted DATE
+);
+
+CREATE TABLE IF NOT EXISTS companies_mlog (
+    company VARCHAR,
+    old_new CHAR(1),   -- N adds the row, O retracts it
+    salary_max REAL
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_companies_ins
+AFTER INSERT ON raw_jobs
+WHEN NEW.company IS NOT NULL AND NEW.salary_max > 1000
+BEGIN
+    INSERT INTO companies_mlog VALUES (NEW.company, 'N', NEW.salary_max);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_companies_upd
+AFTER UPDATE OF company, salary_max, created ON raw_jobs
+BEGIN
+    INSERT INTO companies_mlog
+    SELECT OLD.company, 'O', OLD.salary_max
+    WHERE OLD.company IS NOT NULL AND OLD.salary_max > 1000;
+
+    INSERT INTO companies_mlog
+    SELECT NEW.company, 'N', NEW.salary_max
+    WHERE NEW.company IS NOT NULL AND NEW.salary_max > 1000;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_companies_del
+AFTER DELETE ON raw_jobs
+WHEN OLD.company IS NOT NULL AND OLD.salary_max > 1000
+BEGIN
+    INSERT INTO companies_mlog VALUES (OLD.company, 'O', OLD.salary_max);
+END;
+"""
+
+# Full build of the companies dimension
+rebuild_dim_companies_sql = """
+INSERT INTO dim_companies (company, total_jobs_posted, salary_sum, first_job_posted, last_job_posted)
+SELECT company, COUNT(*), SUM(salary_max), MIN(job_posted_date), MAX(job_posted_date)
+FROM stg_jobs
+WHERE company IS NOT NULL
 GROUP BY company
-HAVING COUNT(*) >= 2;
+"""
 
-CREATE VIEW IF NOT EXISTS skills_analysis AS
-SELECT 
-    TRIM(skill_name) as skill_name,
-    COUNT(*) as job_count,
-    AVG(salary_max) as avg_salary,
-    seniority_level
-FROM (
-    SELECT 
-        CASE 
-            WHEN skills_extracted LIKE '%python%' THEN 'python'
-            WHEN skills_extracted LIKE '%sql%' THEN 'sql'  
-            WHEN skills_extracted LIKE '%aws%' THEN 'aws'
-            WHEN skills_extracted LIKE '%java%' THEN 'java'
-            WHEN skills_extracted LIKE '%react%' THEN 'react'
-        END as skill_name,
-        salary_max, seniority_level
-    FROM stg_jobs
-    WHERE skills_extracted IS NOT NULL
-) skills
-WHERE skill_name IS NOT NULL
-GROUP BY skill_name, seniority_level;
+# Distinct values for the dashboard filters, kept current by triggers so the
+# sidebar never has to scan stg_jobs: a value is added when a qualifying row
+# gains it and pruned when the last qualifying row loses it. Inserts check
+# NOT EXISTS rather than OR IGNORE, which an outer UPSERT's conflict handling
+# would override inside the trigger
+filter_dims_sql = """
+CREATE TABLE IF NOT EXISTS dim_locations (
+    location VARCHAR PRIMARY KEY,
+    city VARCHAR,
+    state VARCHAR,
+    country VARCHAR,
+    coordinates VARCHAR
+);
+
+CREATE TABLE IF NOT EXISTS dim_seniority (
+    level VARCHAR PRIMARY KEY
+);
+
+DELETE FROM dim_locations;
+INSERT INTO dim_locations (location)
+SELECT DISTINCT location FROM stg_jobs WHERE location IS NOT NULL;
+
+DELETE FROM dim_seniority;
+INSERT INTO dim_seniority (level)
+SELECT DISTINCT seniority_level FROM stg_jobs WHERE seniority_level IS NOT NULL;
+
+DROP TRIGGER IF EXISTS trg_raw_jobs_dim_locations;
+CREATE TRIGGER trg_raw_jobs_dim_locations
+AFTER INSERT ON raw_jobs
+WHEN NEW.location IS NOT NULL AND NEW.salary_max > 1000
+BEGIN
+    INSERT INTO dim_locations (location)
+    SELECT NEW.location WHERE NOT EXISTS (SELECT 1 FROM dim_locations WHERE location = NEW.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_dim_locations_upd
+AFTER UPDATE OF location, salary_max ON raw_jobs
+BEGIN
+    INSERT INTO dim_locations (location)
+    SELECT NEW.location WHERE NEW.location IS NOT NULL AND NEW.salary_max > 1000
+      AND NOT EXISTS (SELECT 1 FROM dim_locations WHERE location = NEW.location);
+
+    DELETE FROM dim_locations
+    WHERE location = OLD.location
+      AND NOT EXISTS (SELECT 1 FROM raw_jobs WHERE location = OLD.location AND salary_max > 1000);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_dim_locations_del
+AFTER DELETE ON raw_jobs
+WHEN OLD.location IS NOT NULL
+BEGIN
+    DELETE FROM dim_locations
+    WHERE location = OLD.location
+      AND NOT EXISTS (SELECT 1 FROM raw_jobs WHERE location = OLD.location AND salary_max > 1000);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_dim_seniority_ins
+AFTER INSERT ON raw_jobs
+WHEN NEW.seniority_level IS NOT NULL AND NEW.salary_max > 1000
+BEGIN
+    INSERT INTO dim_seniority (level)
+    SELECT NEW.seniority_level WHERE NOT EXISTS (SELECT 1 FROM dim_seniority WHERE level = NEW.seniority_level);
+END;
+
+DROP TRIGGER IF EXISTS trg_raw_jobs_dim_seniority;
+CREATE TRIGGER trg_raw_jobs_dim_seniority
+AFTER UPDATE OF seniority_level, salary_max ON raw_jobs
+BEGIN
+    INSERT INTO dim_seniority (level)
+    SELECT NEW.seniority_level WHERE NEW.seniority_level IS NOT NULL AND NEW.salary_max > 1000
+      AND NOT EXISTS (SELECT 1 FROM dim_seniority WHERE level = NEW.seniority_level);
+
+    DELETE FROM dim_seniority
+    WHERE level = OLD.seniority_level
+      AND NOT EXISTS (SELECT 1 FROM raw_jobs WHERE seniority_level = OLD.seniority_level AND salary_max > 1000);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_dim_seniority_del
+AFTER DELETE ON raw_jobs
+WHEN OLD.seniority_level IS NOT NULL
+BEGIN
+    DELETE FROM dim_seniority
+    WHERE level = OLD.seniority_level
+      AND NOT EXISTS (SELECT 1 FROM raw_jobs WHERE seniority_level = OLD.seniority_level AND salary_max > 1000);
+END;
 """
 
-with sqlite3.connect(settings.DATABASE_PATH) as conn:
-    for statement in sql_commands.split(';'):
-        statement = statement.strip()
-        if statement:
-            conn.execute(statement)
+# Skills aggregate maintained incrementally: triggers on raw_jobs write one
+# delta row per matched skill into skills_mlog, refresh_skills_analysis()
+# folds the deltas into skills_analysis.
+#
+# A skill matches when it is a whole element of the comma-separated
+# skills_extracted list ('java' does not match 'javascript'); full-table
+# passes use the skills_fts inverted index with the same semantics.
+skills_sql = """
+CREATE TABLE IF NOT EXISTS skill_keywords (
+    skill_name VARCHAR PRIMARY KEY
+);
+
+INSERT OR IGNORE INTO skill_keywords (skill_name)
+VALUES ('python'), ('sql'), ('aws'), ('java'), ('react');
+
+-- Full-text index over skills_extracted, rowid shared with raw_jobs
+CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(id UNINDEXED, skills);
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_skills_fts_ins
+AFTER INSERT ON raw_jobs
+WHEN NEW.skills_extracted IS NOT NULL
+BEGIN
+    INSERT INTO skills_fts (rowid, id, skills) VALUES (NEW.rowid, NEW.id, NEW.skills_extracted);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_skills_fts_upd
+AFTER UPDATE OF skills_extracted ON raw_jobs
+BEGIN
+    DELETE FROM skills_fts WHERE rowid = OLD.rowid;
+
+    INSERT INTO skills_fts (rowid, id, skills)
+    SELECT NEW.rowid, NEW.id, NEW.skills_extracted
+    WHERE NEW.skills_extracted IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_skills_fts_del
+AFTER DELETE ON raw_jobs
+BEGIN
+    DELETE FROM skills_fts WHERE rowid = OLD.rowid;
+END;
+
+-- One row per (job, skill) so skill lookups are index range scans
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id VARCHAR,
+    skill_name VARCHAR,
+    PRIMARY KEY (job_id, skill_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_skills_name ON job_skills(skill_name, job_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_job_skills_ins
+AFTER INSERT ON raw_jobs
+WHEN NEW.skills_extracted IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO job_skills (job_id, skill_name)
+    SELECT NEW.id, k.skill_name
+    FROM skill_keywords k
+    WHERE INSTR(',' || LOWER(NEW.skills_extracted) || ',', ',' || k.skill_name || ',') > 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_job_skills_upd
+AFTER UPDATE OF skills_extracted ON raw_jobs
+BEGIN
+    DELETE FROM job_skills WHERE job_id = OLD.id;
+
+    INSERT OR IGNORE INTO job_skills (job_id, skill_name)
+    SELECT NEW.id, k.skill_name
+    FROM skill_keywords k
+    WHERE NEW.skills_extracted IS NOT NULL
+      AND INSTR(',' || LOWER(NEW.skills_extracted) || ',', ',' || k.skill_name || ',') > 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_job_skills_del
+AFTER DELETE ON raw_jobs
+BEGIN
+    DELETE FROM job_skills WHERE job_id = OLD.id;
+END;
+
+CREATE TABLE IF NOT EXISTS skills_analysis (
+    skill_name VARCHAR,
+    seniority_level VARCHAR,
+    job_count INTEGER NOT NULL DEFAULT 0,
+    salary_sum REAL NOT NULL DEFAULT 0,
+    avg_salary REAL GENERATED ALWAYS AS (salary_sum / NULLIF(job_count, 0)) VIRTUAL,
+    PRIMARY KEY (skill_name, seniority_level)
+);
+
+CREATE TABLE IF NOT EXISTS skills_mlog (
+    job_id VARCHAR,
+    dmltype CHAR(1),   -- I / U / D
+    old_new CHAR(1),   -- N adds the row, O retracts it
+    skill_name VARCHAR,
+    seniority_level VARCHAR,
+    salary_max REAL
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_skills_ins
+AFTER INSERT ON raw_jobs
+WHEN NEW.skills_extracted IS NOT NULL AND NEW.salary_max > 1000
+BEGIN
+    INSERT INTO skills_mlog
+    SELECT NEW.id, 'I', 'N', k.skill_name, IFNULL(NEW.seniority_level, 'Unknown'), NEW.salary_max
+    FROM skill_keywords k
+    WHERE INSTR(',' || LOWER(NEW.skills_extracted) || ',', ',' || k.skill_name || ',') > 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_skills_upd
+AFTER UPDATE OF skills_extracted, seniority_level, salary_max ON raw_jobs
+BEGIN
+    INSERT INTO skills_mlog
+    SELECT OLD.id, 'U', 'O', k.skill_name, IFNULL(OLD.seniority_level, 'Unknown'), OLD.salary_max
+    FROM skill_keywords k
+    WHERE OLD.skills_extracted IS NOT NULL AND OLD.salary_max > 1000
+      AND INSTR(',' || LOWER(OLD.skills_extracted) || ',', ',' || k.skill_name || ',') > 0;
+
+    INSERT INTO skills_mlog
+    SELECT NEW.id, 'U', 'N', k.skill_name, IFNULL(NEW.seniority_level, 'Unknown'), NEW.salary_max
+    FROM skill_keywords k
+    WHERE NEW.skills_extracted IS NOT NULL AND NEW.salary_max > 1000
+      AND INSTR(',' || LOWER(NEW.skills_extracted) || ',', ',' || k.skill_name || ',') > 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_jobs_skills_del
+AFTER DELETE ON raw_jobs
+WHEN OLD.skills_extracted IS NOT NULL AND OLD.salary_max > 1000
+BEGIN
+    INSERT INTO skills_mlog
+    SELECT OLD.id, 'D', 'O', k.skill_name, IFNULL(OLD.seniority_level, 'Unknown'), OLD.salary_max
+    FROM skill_keywords k
+    WHERE INSTR(',' || LOWER(OLD.skills_extracted) || ',', ',' || k.skill_name || ',') > 0;
+END;
+"""
+
+# One-time backfill of the full-text index for rows loaded before the triggers
+seed_skills_fts_sql = """
+INSERT INTO skills_fts (rowid, id, skills)
+SELECT rowid, id, skills_extracted
+FROM raw_jobs
+WHERE skills_extracted IS NOT NULL
+"""
+
+# Backfill of the bridge table: one inverted-index lookup per skill keyword
+seed_job_skills_sql = """
+INSERT OR IGNORE INTO job_skills (job_id, skill_name)
+SELECT f.id, k.skill_name
+FROM skill_keywords k
+JOIN skills_fts f ON skills_fts MATCH '"' || k.skill_name || '"'
+"""
+
+# Full build of the aggregate from the bridge table
+rebuild_skills_analysis_sql = """
+INSERT INTO skills_analysis (skill_name, seniority_level, job_count, salary_sum)
+SELECT js.skill_name, IFNULL(j.seniority_level, 'Unknown'), COUNT(*), SUM(j.salary_max)
+FROM job_skills js
+JOIN stg_jobs j ON j.id = js.job_id
+GROUP BY js.skill_name, IFNULL(j.seniority_level, 'Unknown')
+"""
+
+
+def refresh_skills_analysis(conn):
+    """Merge pending skills_mlog deltas into skills_analysis"""
+    max_rowid = conn.execute("SELECT MAX(rowid) FROM skills_mlog").fetchone()[0]
+    if max_rowid is None:
+        return 0
+
+    conn.execute("""
+        INSERT INTO skills_analysis (skill_name, seniority_level, job_count, salary_sum)
+        SELECT
+            skill_name,
+            seniority_level,
+            SUM(CASE old_new WHEN 'N' THEN 1 ELSE -1 END),
+            SUM(CASE old_new WHEN 'N' THEN salary_max ELSE -salary_max END)
+        FROM skills_mlog
+        WHERE rowid <= ?
+        GROUP BY skill_name, seniority_level
+        ON CONFLICT (skill_name, seniority_level) DO UPDATE SET
+            job_count = job_count + excluded.job_count,
+            salary_sum = salary_sum + excluded.salary_sum
+    """, (max_rowid,))
+    conn.execute("DELETE FROM skills_analysis WHERE job_count <= 0")
+    conn.execute("DELETE FROM skills_mlog WHERE rowid <= ?", (max_rowid,))
     conn.commit()
+    return max_rowid
+
+
+def refresh_dim_companies(conn):
+    """Merge pending companies_mlog deltas into dim_companies"""
+    max_rowid = conn.execute("SELECT MAX(rowid) FROM companies_mlog").fetchone()[0]
+    if max_rowid is None:
+        return 0
+
+    conn.execute("""
+        INSERT INTO dim_companies (company, total_jobs_posted, salary_sum)
+        SELECT
+            company,
+            SUM(CASE old_new WHEN 'N' THEN 1 ELSE -1 END),
+            SUM(CASE old_new WHEN 'N' THEN salary_max ELSE -salary_max END)
+        FROM companies_mlog
+        WHERE rowid <= ?
+        GROUP BY company
+        ON CONFLICT (company) DO UPDATE SET
+            total_jobs_posted = total_jobs_posted + excluded.total_jobs_posted,
+            salary_sum = salary_sum + excluded.salary_sum
+    """, (max_rowid,))
+    conn.execute("DELETE FROM dim_companies WHERE total_jobs_posted <= 0")
+
+    # MIN/MAX cannot be retracted by a delta: re-read the posting date range
+    # of the companies that changed (idx_rj_company_created)
+    conn.execute("""
+        UPDATE dim_companies
+        SET first_job_posted = (
+                SELECT MIN(job_posted_date) FROM stg_jobs s WHERE s.company = dim_companies.company),
+            last_job_posted = (
+                SELECT MAX(job_posted_date) FROM stg_jobs s WHERE s.company = dim_companies.company)
+        WHERE company IN (SELECT company FROM companies_mlog WHERE rowid <= ?)
+    """, (max_rowid,))
+    conn.execute("DELETE FROM companies_mlog WHERE rowid <= ?", (max_rowid,))
+    conn.commit()
+    return max_rowid
+
+
+def apply_analytics(conn, rebuild=False):
+    """Create the staging view and bring the materialized analytics tables,
+    their indexes and triggers up to date. With rebuild=True the aggregates
+    are recomputed from raw_jobs instead of folding pending deltas, e.g.
+    right after clear_database() and a reload"""
+    # WAL lets dashboards keep reading while the pipeline writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+
+    # Posting date derived once per row so date predicates can use an index
+    # (ALTER TABLE can only add generated columns as VIRTUAL)
+    raw_columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(raw_jobs)")}
+    if 'job_posted_date' not in raw_columns:
+        conn.execute("""
+            ALTER TABLE raw_jobs ADD COLUMN
+            job_posted_date DATE GENERATED ALWAYS AS (DATE(created)) VIRTUAL
+        """)
+
+    # Run each DDL batch as one transaction (one fsync per batch)
+    conn.executescript(f"BEGIN;\n{index_commands}\n{sql_commands}\nCOMMIT;")
+
+    # Replace the old view (or the unused placeholder table created by
+    # SQLiteLoader) with the materialized dimension
+    companies_type = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = 'dim_companies'"
+    ).fetchone()
+    rebuild_companies = companies_type is None
+    if companies_type and companies_type[0] == 'view':
+        conn.execute("DROP VIEW dim_companies")
+        rebuild_companies = True
+    elif companies_type:
+        company_columns = [col[1] for col in conn.execute("PRAGMA table_info(dim_companies)")]
+        if 'total_jobs_posted' not in company_columns:
+            conn.execute("DROP TABLE dim_companies")
+            rebuild_companies = True
+
+    # Tables built before companies_mlog were kept by a rowid watermark that
+    # missed updated and deleted rows: rebuild them
+    companies_mlog_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'companies_mlog'"
+    ).fetchone() is not None
+    conn.execute("DROP TABLE IF EXISTS refresh_state")
+
+    conn.executescript(f"BEGIN;\n{companies_sql}\nCOMMIT;")
+    if rebuild or rebuild_companies or not companies_mlog_exists:
+        conn.execute("DELETE FROM companies_mlog")
+        conn.execute("DELETE FROM dim_companies")
+        conn.execute(rebuild_dim_companies_sql)
+    refresh_dim_companies(conn)
+
+    conn.executescript(f"BEGIN;\n{filter_dims_sql}\nCOMMIT;")
+
+    skills_type = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = 'skills_analysis'"
+    ).fetchone()
+    if skills_type and skills_type[0] == 'view':
+        conn.execute("DROP VIEW skills_analysis")
+
+    job_skills_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_skills'"
+    ).fetchone() is not None
+    skills_fts_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'skills_fts'"
+    ).fetchone() is not None
+
+    conn.executescript(f"BEGIN;\n{skills_sql}\nCOMMIT;")
+    if not skills_fts_exists:
+        conn.execute(seed_skills_fts_sql)
+    # Tables built before the full-text index used substring matching:
+    # rebuild them with the current semantics
+    if not job_skills_exists or not skills_fts_exists:
+        conn.execute("DELETE FROM job_skills")
+        conn.execute(seed_job_skills_sql)
+    if rebuild or not skills_type or skills_type[0] != 'table' or not skills_fts_exists:
+        conn.execute("DELETE FROM skills_mlog")
+        conn.execute("DELETE FROM skills_analysis")
+        conn.execute(rebuild_skills_analysis_sql)
+    refresh_skills_analysis(conn)
+
+
+if __name__ == "__main__":
+    with sqlite3.connect(settings.DATABASE_PATH) as conn:
+        apply_analytics(conn)
 
-print("✅ Analytics views created successfully!")
+    print("✅ Analytics views created successfully!")
 
-# Test the views
-cursor = conn.cursor()
-cursor.execute("SELECT COUNT(*) FROM stg_jobs")
-print(f"Staging jobs: {cursor.fetchone()[0]}")
+    # Test the views
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM stg_jobs")
+    print(f"Staging jobs: {cursor.fetchone()[0]}")
 
-cursor.execute("SELECT COUNT(*) FROM dim_companies")
-print(f"Companies: {cursor.fetchone()[0]}")
+    cursor.execute("SELECT COUNT(*) FROM dim_companies WHERE total_jobs_posted >= 2")
+    print(f"Companies: {cursor.fetchone()[0]}")
 
-cursor.execute("SELECT COUNT(*) FROM skills_analysis")
-print(f"Skills: {cursor.fetchone()[0]}")
+    cursor.execute("SELECT COUNT(*) FROM skills_analysis")
+    print(f"Skills: {cursor.fetchone()[0]}")
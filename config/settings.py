@@ -1,14 +1,21 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 from typing import Optional
 
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Settings:
     # API Settings
     ADZUNA_API_ID: Optional[str] = os.getenv("ADZUNA_API_ID")
     ADZUNA_API_KEY: Optional[str] = os.getenv("ADZUNA_API_KEY")
     ADZUNA_BASE_URL: str = "https://api.adzuna.com/v1/api"
+    
+    # API response cache (Redis when REDIS_URL is set, otherwise on disk)
+    HTTP_CACHE_DIR: str = os.getenv("HTTP_CACHE_DIR", "./data/.http_cache")
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
 
     
     # Database (SQLite instead of DuckDB for Windows compatibility)
@@ -17,4 +24,11 @@ class Settings:
     # Pipeline
     BATCH_SIZE: int = 100
     MAX_RETRIES: int = 3
-    RATE_LIMIT_DELAY: int = 1  # seconds between API calls
\ No newline at end of file
+    RATE_LIMIT_DELAY: int = 1  # seconds between API calls
+    MAX_CONCURRENCY: int = int(os.getenv("MAX_CONCURRENCY", "16"))  # in-flight API requests
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings instance, shared across Streamlit reruns"""
+    return Settings()
@@ -1,20 +1,131 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import os
 import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
-from config.settings import Settings
+from config.settings import get_settings
 
 
 
 # Add project root to path
 sys.path.append('..')
-from config.settings import Settings
+from config.settings import get_settings
+
+
+@st.cache_resource
+def get_conn(db_path):
+    """Shared SQLite connection, reused across reruns"""
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+def get_db_mtime(db_path):
+    """Cache key for the database: in WAL mode commits land in the -wal file
+    and leave the main file untouched until a checkpoint, so take the newer
+    of the two mtimes"""
+    wal_path = db_path + '-wal'
+    wal_mtime = os.path.getmtime(wal_path) if os.path.exists(wal_path) else 0
+    return max(os.path.getmtime(db_path), wal_mtime)
+
+
+# Shared WHERE clause for the sidebar filters; 'All' disables a filter
+FILTER_SQL = "(? = 'All' OR location = ?) AND (? = 'All' OR seniority_level = ?)"
+
+
+def _filter_params(location, seniority):
+    return (location, location, seniority, seniority)
+
+
+@st.cache_data(ttl=300)
+def get_filter_options(db_path, db_mtime):
+    """Sidebar selectbox values from the precomputed filter dimensions"""
+    conn = get_conn(db_path)
+    rows = conn.execute("""
+        SELECT 'location', location FROM dim_locations
+        UNION ALL
+        SELECT 'level', level FROM dim_seniority
+        ORDER BY 1, 2
+    """).fetchall()
+    locations = [value for kind, value in rows if kind == 'location']
+    seniority_levels = [value for kind, value in rows if kind == 'level']
+    return locations, seniority_levels
+
+
+@st.cache_data(ttl=300)
+def get_metrics(db_path, db_mtime, location, seniority):
+    """Job count, average salary, remote count and distinct companies"""
+    conn = get_conn(db_path)
+    return conn.execute(f"""
+        SELECT COUNT(*), AVG(salary_max),
+               SUM(CASE WHEN is_remote THEN 1 ELSE 0 END), COUNT(DISTINCT company)
+        FROM stg_jobs
+        WHERE {FILTER_SQL}
+    """, _filter_params(location, seniority)).fetchone()
+
+
+@st.cache_data(ttl=300)
+def get_salary_by_seniority(db_path, db_mtime, location, seniority):
+    """(seniority_level, salary_max) points for the seniority box plot"""
+    conn = get_conn(db_path)
+    return conn.execute(f"""
+        SELECT seniority_level, salary_max
+        FROM stg_jobs
+        WHERE {FILTER_SQL}
+    """, _filter_params(location, seniority)).fetchall()
+
+
+@st.cache_data(ttl=300)
+def get_location_counts(db_path, db_mtime, location, seniority):
+    """Top 10 (location, job_count) rows"""
+    conn = get_conn(db_path)
+    return conn.execute(f"""
+        SELECT location, COUNT(*) AS job_count
+        FROM stg_jobs
+        WHERE {FILTER_SQL} AND location IS NOT NULL
+        GROUP BY location
+        ORDER BY job_count DESC
+        LIMIT 10
+    """, _filter_params(location, seniority)).fetchall()
+
+
+@st.cache_data(ttl=300)
+def get_top_rankings(db_path, db_mtime):
+    """Top 10 (company, total_jobs_posted) and (skill_name, job_count) rows"""
+    conn = get_conn(db_path)
+    rows = conn.execute("""
+        SELECT * FROM (
+            SELECT 'company', company, total_jobs_posted FROM dim_companies
+            WHERE total_jobs_posted >= 2
+            ORDER BY total_jobs_posted DESC
+            LIMIT 10
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'skill', skill_name, job_count FROM skills_analysis
+            ORDER BY job_count DESC
+            LIMIT 10
+        )
+    """).fetchall()
+    companies = [(name, count) for kind, name, count in rows if kind == 'company']
+    skills = [(name, count) for kind, name, count in rows if kind == 'skill']
+    return companies, skills
+
+
+@st.cache_data(ttl=300)
+def get_recent_jobs(db_path, db_mtime, location, seniority, limit=50):
+    """Most recent job postings matching the filters"""
+    conn = get_conn(db_path)
+    return pd.read_sql_query(f"""
+        SELECT title, company, location, salary_max, seniority_level, is_remote
+        FROM stg_jobs
+        WHERE {FILTER_SQL}
+        ORDER BY job_posted_date DESC
+        LIMIT ?
+    """, conn, params=_filter_params(location, seniority) + (limit,))
+
 
 class JobMarketDashboard:
     """
@@ -27,54 +138,30 @@ class JobMarketDashboard:
     """
     
     def __init__(self):
-        self.settings = Settings()
+        self.settings = get_settings()
         st.set_page_config(
             page_title="Job Market Analytics",
             page_icon="💼",
             layout="wide"
         )
     
-    def load_data(self):
-        """Load data from SQLite (removed caching to fix error)"""
-        conn = sqlite3.connect(self.settings.DATABASE_PATH)
-        
-        # Load staging jobs data
-        jobs_df = pd.read_sql_query("""
-            SELECT * FROM stg_jobs 
-            ORDER BY job_posted_date DESC
-        """, conn)
-        
-        # Load company data
-        companies_df = pd.read_sql_query("""
-            SELECT * FROM dim_companies 
-            ORDER BY total_jobs_posted DESC
-            LIMIT 20
-        """, conn)
-        
-        # Load skills analysis
-        skills_df = pd.read_sql_query("""
-            SELECT * FROM skills_analysis 
-            ORDER BY job_count DESC
-            LIMIT 20
-        """, conn)
-        
-        conn.close()
-        return jobs_df, companies_df, skills_df
-    
     def run_dashboard(self):
         """Main dashboard application"""
         st.title("💼 Job Market Analytics Dashboard")
         st.markdown("Real-time insights from job market data")
         
-        # Load data
+        db_path = self.settings.DATABASE_PATH
+        
+        # Load filter options
         try:
-            jobs_df, companies_df, skills_df = self.load_data()
+            db_mtime = get_db_mtime(db_path)
+            locations, seniority_levels = get_filter_options(db_path, db_mtime)
         except Exception as e:
             st.error(f"Error loading data: {e}")
             st.info("Make sure you've run the pipeline and created analytics views first!")
             return
         
-        if jobs_df.empty:
+        if not locations and not seniority_levels:
             st.warning("No data available. Please run the pipeline first!")
             return
         
@@ -82,41 +169,32 @@ class JobMarketDashboard:
         st.sidebar.header("Filters")
         
         # Location filter
-        locations = jobs_df['location'].dropna().unique()
-        selected_location = st.sidebar.selectbox("Select Location", ["All"] + list(locations))
+        selected_location = st.sidebar.selectbox("Select Location", ["All"] + locations)
         
         # Seniority filter
-        seniority_levels = jobs_df['seniority_level'].dropna().unique()
-        selected_seniority = st.sidebar.selectbox("Seniority Level", ["All"] + list(seniority_levels))
+        selected_seniority = st.sidebar.selectbox("Seniority Level", ["All"] + seniority_levels)
         
-        # Apply filters
-        filtered_df = jobs_df.copy()
-        if selected_location != "All":
-            filtered_df = filtered_df[filtered_df['location'] == selected_location]
-        if selected_seniority != "All":
-            filtered_df = filtered_df[filtered_df['seniority_level'] == selected_seniority]
+        filters = (db_path, db_mtime, selected_location, selected_seniority)
+        total_jobs, avg_salary, remote_count, unique_companies = get_metrics(*filters)
+        company_rows, skill_rows = get_top_rankings(db_path, db_mtime)
         
         # Key Metrics Row
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_jobs = len(filtered_df)
             st.metric("Total Jobs", f"{total_jobs:,}")
         
         with col2:
-            avg_salary = filtered_df['salary_max'].mean() if len(filtered_df) > 0 else 0
-            st.metric("Avg Max Salary", f"${avg_salary:,.0f}")
+            st.metric("Avg Max Salary", f"${avg_salary or 0:,.0f}")
         
         with col3:
-            if len(filtered_df) > 0 and 'is_remote' in filtered_df.columns:
-                remote_count = filtered_df['is_remote'].sum()
-                remote_pct = (remote_count / len(filtered_df) * 100)
+            if total_jobs > 0 and remote_count is not None:
+                remote_pct = (remote_count / total_jobs * 100)
                 st.metric("Remote Jobs %", f"{remote_pct:.1f}%")
             else:
                 st.metric("Remote Jobs %", "N/A")
         
         with col4:
-            unique_companies = filtered_df['company'].nunique()
             st.metric("Companies Hiring", f"{unique_companies:,}")
         
         # Charts Row 1
@@ -124,29 +202,31 @@ class JobMarketDashboard:
         
         with col1:
             st.subheader("💰 Salary Distribution by Seniority")
-            if 'seniority_level' in filtered_df.columns and len(filtered_df) > 0:
-                salary_box = px.box(
-                    filtered_df, 
-                    x='seniority_level', 
-                    y='salary_max',
-                    title="Salary Ranges by Experience Level"
+            salary_rows = get_salary_by_seniority(*filters)
+            if salary_rows:
+                levels, salaries = zip(*salary_rows)
+                salary_box = go.Figure(go.Box(x=levels, y=salaries))
+                salary_box.update_layout(
+                    title="Salary Ranges by Experience Level",
+                    xaxis_title="seniority_level",
+                    yaxis_title="salary_max",
+                    height=400
                 )
-                salary_box.update_layout(height=400)
                 st.plotly_chart(salary_box, use_container_width=True)
             else:
                 st.info("No seniority data available")
         
         with col2:
             st.subheader("🏢 Top Hiring Companies")
-            if len(companies_df) > 0:
-                company_bar = px.bar(
-                    companies_df.head(10),
-                    x='total_jobs_posted',
-                    y='company',
-                    orientation='h',
-                    title="Companies with Most Job Postings"
+            if company_rows:
+                companies, job_counts = zip(*company_rows)
+                company_bar = go.Figure(go.Bar(x=job_counts, y=companies, orientation='h'))
+                company_bar.update_layout(
+                    title="Companies with Most Job Postings",
+                    xaxis_title="total_jobs_posted",
+                    yaxis_title="company",
+                    height=400
                 )
-                company_bar.update_layout(height=400)
                 st.plotly_chart(company_bar, use_container_width=True)
             else:
                 st.info("No company data available")
@@ -156,29 +236,27 @@ class JobMarketDashboard:
         
         with col1:
             st.subheader("📍 Jobs by Location")
-            if len(filtered_df) > 0:
-                location_counts = filtered_df['location'].value_counts().head(10)
-                if len(location_counts) > 0:
-                    location_pie = px.pie(
-                        values=location_counts.values,
-                        names=location_counts.index,
-                        title="Geographic Distribution of Jobs"
-                    )
+            if total_jobs > 0:
+                location_rows = get_location_counts(*filters)
+                if location_rows:
+                    names, job_counts = zip(*location_rows)
+                    location_pie = go.Figure(go.Pie(labels=names, values=job_counts))
+                    location_pie.update_layout(title="Geographic Distribution of Jobs")
                     st.plotly_chart(location_pie, use_container_width=True)
                 else:
                     st.info("No location data available")
         
         with col2:
             st.subheader("🛠️ Top Skills Demand")
-            if len(skills_df) > 0:
-                skills_bar = px.bar(
-                    skills_df.head(10),
-                    x='job_count',
-                    y='skill_name',
-                    orientation='h',
-                    title="Most In-Demand Skills"
+            if skill_rows:
+                skills, job_counts = zip(*skill_rows)
+                skills_bar = go.Figure(go.Bar(x=job_counts, y=skills, orientation='h'))
+                skills_bar.update_layout(
+                    title="Most In-Demand Skills",
+                    xaxis_title="job_count",
+                    yaxis_title="skill_name",
+                    height=400
                 )
-                skills_bar.update_layout(height=400)
                 st.plotly_chart(skills_bar, use_container_width=True)
             else:
                 st.info("No skills data available")
@@ -187,9 +265,7 @@ class JobMarketDashboard:
         st.subheader("📋 Recent Job Postings")
         
         # Display options
-        available_cols = ['title', 'company', 'location', 'salary_max', 'seniority_level']
-        if 'is_remote' in filtered_df.columns:
-            available_cols.append('is_remote')
+        available_cols = ['title', 'company', 'location', 'salary_max', 'seniority_level', 'is_remote']
             
         display_cols = st.multiselect(
             "Select columns to display:",
@@ -197,13 +273,12 @@ class JobMarketDashboard:
             default=['title', 'company', 'location', 'salary_max']
         )
         
-        if display_cols and len(filtered_df) > 0:
-            existing_cols = [col for col in display_cols if col in filtered_df.columns]
-            if existing_cols:
-                st.dataframe(
-                    filtered_df[existing_cols].head(50),
-                    use_container_width=True
-                )
+        if display_cols and total_jobs > 0:
+            recent_jobs = get_recent_jobs(*filters)
+            st.dataframe(
+                recent_jobs[display_cols],
+                use_container_width=True
+            )
 
 # Run the dashboard
 if __name__ == "__main__":
@@ -1,18 +1,160 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+import functools
+import io
 import sys
 import os
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:  # Arrow fetch is optional; fall back to sqlite3 + pandas
+    adbc_sqlite = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # CSV export falls back to pandas' writer
+    pa = None
+
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
-from config.settings import Settings
+from config.settings import get_settings
 
 # Add project root to path
 sys.path.append('..')
-from config.settings import Settings
+from config.settings import get_settings
+
+
+@st.cache_resource
+def get_conn(db_path):
+    """Shared SQLite connection, reused across reruns"""
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+# raw_jobs columns selected when present (transformation columns are
+# only added once the pipeline has run)
+OPTIONAL_COLUMNS = [
+    'salary_min', 'salary_max', 'category', 'created', 'search_keyword',
+    'search_location', 'seniority_level', 'is_remote', 'skills_extracted'
+]
+
+CATEGORICAL_COLUMNS = ['company', 'location', 'seniority_level', 'search_keyword']
+
+
+@functools.lru_cache(maxsize=8)
+def resolve_schema(db_path, db_mtime):
+    """Resolve raw_jobs columns once per database version and build the
+    SELECT used by the dashboard"""
+    conn = get_conn(db_path)
+    available_columns = [row[1] for row in conn.execute("PRAGMA table_info(raw_jobs)")]
+    
+    select_columns = ['id', 'title', 'company', 'location']
+    select_columns += [col for col in OPTIONAL_COLUMNS if col in available_columns]
+    
+    # Walk the timestamp index instead of sorting when it has been created
+    has_created_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_rj_created_desc'"
+    ).fetchone() is not None
+    index_hint = "INDEXED BY idx_rj_created_desc" if has_created_index else ""
+    
+    select_sql = f"""
+        SELECT {', '.join(select_columns)}
+        FROM raw_jobs {index_hint}
+        WHERE salary_max > 1000 
+        ORDER BY created DESC
+        LIMIT ?
+    """
+    return available_columns, select_sql
+
+
+@st.cache_data(ttl=300)
+def load_raw_jobs(db_path, db_mtime, select_sql, limit=1000):
+    """Load recent jobs from raw_jobs; keyed on the DB path and its mtime so
+    a pipeline rewrite of the file invalidates the cache"""
+    if adbc_sqlite is not None:
+        # Columnar fetch straight into Arrow buffers, no per-row tuples
+        with adbc_sqlite.connect(db_path) as arrow_conn:
+            with arrow_conn.cursor() as cursor:
+                cursor.execute(select_sql, (limit,))
+                jobs_df = cursor.fetch_arrow_table().to_pandas()
+    else:
+        jobs_df = pd.read_sql_query(select_sql, get_conn(db_path), params=(limit,))
+    
+    # Repeated short strings as categories: int codes instead of objects
+    for col in CATEGORICAL_COLUMNS:
+        if col in jobs_df.columns:
+            jobs_df[col] = jobs_df[col].astype('category')
+    
+    return jobs_df
+
+
+def top_counts(series, n=None):
+    """value_counts() without the zero-count categories of a categorical"""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    return counts.head(n) if n else counts
+
+
+def to_csv_bytes(df):
+    """Encode a DataFrame as CSV bytes, using Arrow's C writer when available"""
+    buf = io.BytesIO()
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Categoricals arrive as dictionary arrays, which the writer rejects
+        table = table.cast(pa.schema([
+            field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ]))
+        pa_csv.write_csv(table, buf)
+    else:
+        df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def sorted_options(series):
+    """Sorted distinct non-null values; a categorical already holds them as
+    its categories, so no scan of the column is needed"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.tolist()
+    return series.dropna().drop_duplicates().sort_values().tolist()
+
+
+@st.cache_data(ttl=300)
+def load_jobs_page(db_path, db_mtime, columns, company, location, cursor=None, page_size=50):
+    """One page of jobs, newest first, using keyset pagination: ``cursor`` is
+    the (created, id) of the last row on the previous page. A NULL created
+    sorts as '' (last) so undated jobs are reachable too"""
+    conditions = [
+        "salary_max > 1000",
+        "(? = 'All' OR company = ?)",
+        "(? = 'All' OR location = ?)",
+    ]
+    params = [company, company, location, location]
+    if cursor is not None:
+        conditions.append("(COALESCE(created, ''), id) < (?, ?)")
+        params.extend(cursor)
+    
+    query = f"""
+        SELECT {', '.join(columns)}, COALESCE(created, '') AS _cursor_created, id AS _cursor_id
+        FROM raw_jobs
+        WHERE {' AND '.join(conditions)}
+        ORDER BY COALESCE(created, '') DESC, id DESC
+        LIMIT ?
+    """
+    params.append(page_size)
+    return pd.read_sql_query(query, get_conn(db_path), params=params)
+
+
+def _next_page(cursor):
+    st.session_state['page_cursors'].append(cursor)
+
+
+def _prev_page():
+    st.session_state['page_cursors'].pop()
+
 
 class JobMarketDashboard:
     """
@@ -21,16 +163,31 @@ class JobMarketDashboard:
     """
     
     def __init__(self):
-        self.settings = Settings()
+        self.settings = get_settings()
         st.set_page_config(
             page_title="Job Market Analytics",
             page_icon="💼",
             layout="wide"
         )
+        
+        # Resolve the raw_jobs schema once instead of on every load
+        self._available_columns, self._select_sql = resolve_schema(
+            self.settings.DATABASE_PATH, self._db_mtime()
+        )
+    
+    def _db_mtime(self):
+        """Modification time of the database, used as a cache key; in WAL mode
+        commits only touch the -wal file until a checkpoint, so take the newer
+        of the two"""
+        db_path = self.settings.DATABASE_PATH
+        return max(
+            (os.path.getmtime(path) for path in (db_path, db_path + '-wal') if os.path.exists(path)),
+            default=0,
+        )
     
     def get_available_tables_and_views(self):
         """Check what data is actually available"""
-        conn = sqlite3.connect(self.settings.DATABASE_PATH)
+        conn = get_conn(self.settings.DATABASE_PATH)
         
         # Get all tables and views
         tables_df = pd.read_sql_query("""
@@ -39,51 +196,12 @@ class JobMarketDashboard:
             ORDER BY type, name
         """, conn)
         
-        conn.close()
         return tables_df
     
     def load_raw_jobs_data(self):
-        """Load data directly from raw_jobs table"""
-        conn = sqlite3.connect(self.settings.DATABASE_PATH)
-        
-        # Get column info
-        columns_df = pd.read_sql_query("PRAGMA table_info(raw_jobs)", conn)
-        available_columns = columns_df['name'].tolist()
-        
-        # Build query based on available columns
-        select_columns = ['id', 'title', 'company', 'location']
-        
-        if 'salary_min' in available_columns:
-            select_columns.append('salary_min')
-        if 'salary_max' in available_columns:
-            select_columns.append('salary_max')
-        if 'category' in available_columns:
-            select_columns.append('category')
-        if 'created' in available_columns:
-            select_columns.append('created')
-        if 'search_keyword' in available_columns:
-            select_columns.append('search_keyword')
-        if 'search_location' in available_columns:
-            select_columns.append('search_location')
-        if 'seniority_level' in available_columns:
-            select_columns.append('seniority_level')
-        if 'is_remote' in available_columns:
-            select_columns.append('is_remote')
-        if 'skills_extracted' in available_columns:
-            select_columns.append('skills_extracted')
-        
-        query = f"""
-            SELECT {', '.join(select_columns)}
-            FROM raw_jobs 
-            WHERE salary_max > 1000 
-            ORDER BY created DESC
-            LIMIT 1000
-        """
-        
-        jobs_df = pd.read_sql_query(query, conn)
-        conn.close()
-        
-        return jobs_df, available_columns
+        """Load data directly from raw_jobs table (cached per database file version)"""
+        jobs_df = load_raw_jobs(self.settings.DATABASE_PATH, self._db_mtime(), self._select_sql)
+        return jobs_df, self._available_columns
     
     def run_dashboard(self):
         """Main dashboard application"""
@@ -136,19 +254,19 @@ class JobMarketDashboard:
         
         # Company filter
         if len(jobs_df) > 0:
-            companies = ['All'] + sorted(jobs_df['company'].dropna().unique().tolist())
+            companies = ['All'] + sorted_options(jobs_df['company'])
             selected_company = st.sidebar.selectbox("Company", companies)
             
             # Location filter
-            locations = ['All'] + sorted(jobs_df['location'].dropna().unique().tolist())
+            locations = ['All'] + sorted_options(jobs_df['location'])
             selected_location = st.sidebar.selectbox("Location", locations)
             
-            # Apply filters
-            filtered_df = jobs_df.copy()
-            if selected_company != 'All':
-                filtered_df = filtered_df[filtered_df['company'] == selected_company]
-            if selected_location != 'All':
-                filtered_df = filtered_df[filtered_df['location'] == selected_location]
+            # Apply filters as one boolean mask, no intermediate copies
+            mask = (
+                ((selected_company == 'All') | (jobs_df['company'] == selected_company))
+                & ((selected_location == 'All') | (jobs_df['location'] == selected_location))
+            )
+            filtered_df = jobs_df[mask]
         else:
             filtered_df = jobs_df
         
@@ -156,16 +274,19 @@ class JobMarketDashboard:
         if len(filtered_df) > 0:
             # Chart 1: Top Companies
             st.subheader("🏢 Top Hiring Companies")
-            company_counts = filtered_df['company'].value_counts().head(15)
+            company_counts = top_counts(filtered_df['company'], 15)
             if len(company_counts) > 0:
-                fig_companies = px.bar(
+                fig_companies = go.Figure(go.Bar(
                     x=company_counts.values,
-                    y=company_counts.index,
-                    orientation='h',
+                    y=company_counts.index.tolist(),
+                    orientation='h'
+                ))
+                fig_companies.update_layout(
                     title="Companies with Most Job Postings",
-                    labels={'x': 'Number of Jobs', 'y': 'Company'}
+                    xaxis_title="Number of Jobs",
+                    yaxis_title="Company",
+                    height=500
                 )
-                fig_companies.update_layout(height=500)
                 st.plotly_chart(fig_companies, use_container_width=True)
             
             # Chart 2: Salary Distribution (if available)
@@ -175,49 +296,55 @@ class JobMarketDashboard:
                 
                 with col1:
                     # Salary histogram
-                    fig_salary_hist = px.histogram(
-                        filtered_df,
-                        x='salary_max',
+                    fig_salary_hist = go.Figure(go.Histogram(
+                        x=filtered_df['salary_max'].values,
+                        nbinsx=30
+                    ))
+                    fig_salary_hist.update_layout(
                         title="Salary Distribution",
-                        nbins=30
+                        xaxis_title="salary_max",
+                        yaxis_title="count"
                     )
                     st.plotly_chart(fig_salary_hist, use_container_width=True)
                 
                 with col2:
                     # Salary by company (top 10)
                     top_companies = company_counts.head(10).index
-                    salary_by_company = filtered_df[filtered_df['company'].isin(top_companies)].groupby('company')['salary_max'].mean().sort_values(ascending=False)
+                    salary_by_company = filtered_df[filtered_df['company'].isin(top_companies)].groupby('company', observed=True)['salary_max'].mean().sort_values(ascending=False)
                     
-                    fig_salary_company = px.bar(
+                    fig_salary_company = go.Figure(go.Bar(
                         x=salary_by_company.values,
-                        y=salary_by_company.index,
-                        orientation='h',
+                        y=salary_by_company.index.tolist(),
+                        orientation='h'
+                    ))
+                    fig_salary_company.update_layout(
                         title="Average Max Salary by Company (Top 10)",
-                        labels={'x': 'Average Max Salary', 'y': 'Company'}
+                        xaxis_title="Average Max Salary",
+                        yaxis_title="Company"
                     )
                     st.plotly_chart(fig_salary_company, use_container_width=True)
             
             # Chart 3: Geographic Distribution
             st.subheader("📍 Geographic Distribution")
-            location_counts = filtered_df['location'].value_counts().head(15)
+            location_counts = top_counts(filtered_df['location'], 15)
             if len(location_counts) > 0:
-                fig_locations = px.pie(
+                fig_locations = go.Figure(go.Pie(
                     values=location_counts.values,
-                    names=location_counts.index,
-                    title="Jobs by Location"
-                )
+                    labels=location_counts.index.tolist()
+                ))
+                fig_locations.update_layout(title="Jobs by Location")
                 st.plotly_chart(fig_locations, use_container_width=True)
             
             # Chart 4: Search Keywords (if available)
             if 'search_keyword' in filtered_df.columns:
                 st.subheader("🔍 Job Types Searched")
-                keyword_counts = filtered_df['search_keyword'].value_counts()
+                keyword_counts = top_counts(filtered_df['search_keyword'])
                 if len(keyword_counts) > 0:
-                    fig_keywords = px.bar(
-                        x=keyword_counts.index,
-                        y=keyword_counts.values,
-                        title="Jobs by Search Keyword"
-                    )
+                    fig_keywords = go.Figure(go.Bar(
+                        x=keyword_counts.index.tolist(),
+                        y=keyword_counts.values
+                    ))
+                    fig_keywords.update_layout(title="Jobs by Search Keyword")
                     st.plotly_chart(fig_keywords, use_container_width=True)
         
         # Data Table
@@ -231,28 +358,41 @@ class JobMarketDashboard:
         )
         
         if display_columns:
-            # Show data with pagination
+            # Show data with keyset pagination; restart from the first page
+            # whenever the filters change
             page_size = 50
-            total_rows = len(filtered_df)
-            total_pages = (total_rows - 1) // page_size + 1
+            page_filters = (selected_company, selected_location)
+            if st.session_state.get('page_filters') != page_filters:
+                st.session_state['page_filters'] = page_filters
+                st.session_state['page_cursors'] = [None]
+            page_cursors = st.session_state['page_cursors']
             
-            if total_pages > 1:
-                page = st.selectbox("Page", range(1, total_pages + 1))
-                start_idx = (page - 1) * page_size
-                end_idx = start_idx + page_size
-                display_data = filtered_df[display_columns].iloc[start_idx:end_idx]
-            else:
-                display_data = filtered_df[display_columns].head(page_size)
+            page_df = load_jobs_page(
+                self.settings.DATABASE_PATH, self._db_mtime(), tuple(display_columns),
+                selected_company, selected_location, page_cursors[-1], page_size
+            )
+            
+            # The charts above use the most recent sample; this table pages
+            # through every matching job in the database
+            st.caption(f"All matching jobs in the database (charts above: the {len(jobs_df):,} most recent)")
+            st.dataframe(page_df[display_columns], use_container_width=True)
             
-            st.dataframe(display_data, use_container_width=True)
+            prev_col, page_col, next_col = st.columns([1, 4, 1])
+            prev_col.button("⬅️ Prev", on_click=_prev_page, disabled=len(page_cursors) == 1)
+            page_col.caption(f"Page {len(page_cursors)}")
+            if len(page_df) == page_size:
+                last_row = page_df.iloc[-1]
+                next_cursor = (last_row['_cursor_created'], last_row['_cursor_id'])
+                next_col.button("Next ➡️", on_click=_next_page, args=(next_cursor,))
+            else:
+                next_col.button("Next ➡️", disabled=True)
             
             # Download option
             st.subheader("📥 Export Data")
             if st.button("Download Filtered Data as CSV"):
-                csv = filtered_df.to_csv(index=False)
                 st.download_button(
                     label="Download CSV",
-                    data=csv,
+                    data=to_csv_bytes(filtered_df),
                     file_name=f"job_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
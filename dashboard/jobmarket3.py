@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
 import json
-import glob
+import re
+from collections import Counter
+from typing import NamedTuple, Optional
 import os
 import sys
 import os
@@ -12,6 +14,351 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 from config.settings import Settings
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet sidecars are optional; read the CSV directly
+    pa_csv = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json is slower but parses the same files
+    orjson = None
+
+
+DATA_DIR = "data"
+
+# Low-cardinality columns used for filtering and grouping
+CATEGORICAL_COLUMNS = ['company', 'location', 'category', 'search_keyword']
+
+# Columns the dashboard reads
+DASHBOARD_COLUMNS = [
+    'title', 'description', 'company', 'location', 'category',
+    'salary_min', 'salary_max', 'search_keyword'
+]
+
+# Map your actual column names to standard names
+COLUMN_MAPPING = {
+    'company_name': 'company',
+    'location_display': 'location',
+    'category_label': 'category'
+}
+
+# Raw file columns worth reading at all
+SOURCE_COLUMNS = set(DASHBOARD_COLUMNS) | set(COLUMN_MAPPING)
+
+TEXT_COLUMNS = ['title', 'company', 'location', 'category']
+
+
+def compact_frame(df):
+    """Keep only the dashboard columns, salaries as float32 and repeated
+    short strings as categories (int codes instead of objects)"""
+    df = df[[col for col in DASHBOARD_COLUMNS if col in df.columns]]
+    dtypes = {col: 'float32' for col in ['salary_min', 'salary_max'] if col in df.columns}
+    dtypes.update({col: 'category' for col in CATEGORICAL_COLUMNS if col in df.columns})
+    return df.astype(dtypes)
+
+
+def clean_jobs_frame(df):
+    """Standard names, numeric salaries, 'Unknown' for missing text and
+    realistic salaries only, with as few intermediate frames as possible"""
+    # Mapped columns replace any same-named column already in the file
+    mapped = {old: new for old, new in COLUMN_MAPPING.items() if old in df.columns}
+    df = df.drop(columns=[new for new in mapped.values() if new in df.columns])
+    df = df.rename(columns=mapped)
+
+    # Clean and standardize numeric columns (Parquet already keeps floats)
+    df = df.assign(**{
+        col: pd.to_numeric(df[col], errors='coerce')
+        for col in ['salary_max', 'salary_min']
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])
+    })
+
+    # Clean text columns
+    df = df.assign(**{
+        col: df[col].fillna('Unknown').astype(str)
+        for col in TEXT_COLUMNS if col in df.columns
+    })
+
+    # Filter out unrealistic salaries
+    if 'salary_max' in df.columns:
+        df = df[df['salary_max'].between(1000, 1000000, inclusive='neither')]
+
+    return compact_frame(df)
+
+
+def top_counts(series, n=None, exclude=None):
+    """value_counts() without the zero-count categories of a categorical"""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    if exclude is not None:
+        counts = counts.drop(exclude, errors='ignore')
+    return counts.head(n) if n else counts
+
+
+def page_slice(df, columns, start=0, stop=None):
+    """Rows [start, stop) of the given columns. Rows are sliced first so only
+    the page is copied, and categoricals drop the categories not on the page
+    so st.dataframe serializes O(page) data"""
+    page = df.iloc[start:stop][columns].reset_index(drop=True)
+    for col in page.columns:
+        if isinstance(page[col].dtype, pd.CategoricalDtype):
+            page[col] = page[col].cat.remove_unused_categories()
+    return page
+
+
+def sorted_options(series):
+    """Sorted distinct non-null values; a categorical already holds them as
+    its categories, so no scan of the column is needed"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.tolist()
+    return series.dropna().drop_duplicates().sort_values().tolist()
+
+
+@st.cache_data
+def find_latest_data_file(data_dir_mtime):
+    """Find the most recent data file (CSV or JSON); keyed on the data folder
+    mtime, which changes whenever a file is added, removed or renamed"""
+    with os.scandir(DATA_DIR) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_file())
+
+    # Look for specific CSV files first, then fall back to any CSV or JSON
+    for prefix, suffix in [('jobs_analysis_', '.csv'), ('comprehensive_job_data_', '.jsonl'),
+                           ('comprehensive_job_data_', '.json'), ('', '.csv'), ('', '.json')]:
+        matches = [name for name in names if name.startswith(prefix) and name.endswith(suffix)]
+        if matches:
+            return os.path.join(DATA_DIR, matches[-1]), suffix[1:]
+    return None, None
+
+
+def read_csv_arrow(csv_path):
+    """Multithreaded Arrow CSV read with the known column types declared up
+    front; falls back to type inference if a salary cell is not numeric"""
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=8 << 20)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={'salary_min': pa.float32(), 'salary_max': pa.float32()},
+        null_values=['', 'NA', 'NaN', 'null', 'None']
+    )
+    try:
+        return pa_csv.read_csv(csv_path, read_options=read_options, convert_options=convert_options)
+    except pa.ArrowInvalid:
+        return pa_csv.read_csv(csv_path, read_options=read_options)
+
+
+def read_jobs_table(csv_path):
+    """Read a CSV extract through a sibling Parquet file, converting it once
+    and again only when the CSV is newer. The sidecar is a cache: if it cannot
+    be written (read-only or full data dir) the parsed CSV is used directly"""
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    if (os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        columns = [col for col in pq.read_schema(parquet_path).names if col in SOURCE_COLUMNS]
+        return pq.read_table(parquet_path, columns=columns)
+
+    table = read_csv_arrow(csv_path)
+    try:
+        pq.write_table(table, parquet_path, compression='snappy')
+    except OSError:
+        # Don't leave a truncated sidecar that looks newer than the CSV
+        if os.path.exists(parquet_path):
+            try:
+                os.remove(parquet_path)
+            except OSError:
+                pass
+    return table.select([col for col in table.column_names if col in SOURCE_COLUMNS])
+
+
+@st.cache_data(show_spinner=False)
+def load_data_from_csv(file_path, file_mtime):
+    """Load data from CSV file with proper column mapping; keyed on the file
+    mtime so a rewritten file is parsed again"""
+    try:
+        if pa_csv is not None:
+            # Typed columnar copy: later cold starts skip CSV parsing
+            df = read_jobs_table(file_path).to_pandas()
+        else:
+            df = pd.read_csv(file_path, usecols=lambda col: col in SOURCE_COLUMNS)
+
+        return clean_jobs_frame(df)
+
+    except Exception as e:
+        st.error(f"Error loading CSV: {e}")
+        return pd.DataFrame()
+
+
+@st.cache_data(show_spinner=False)
+def load_data_from_json(file_path, file_mtime):
+    """Load data from JSON file; keyed on the file mtime like the CSV loader"""
+    try:
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(file_path, 'rb') as f:
+            if file_path.endswith('.jsonl'):
+                data = [loads(line) for line in f if line.strip()]
+            else:
+                data = loads(f.read())
+
+        # Extract jobs data
+        if isinstance(data, dict) and 'jobs' in data:
+            jobs_data = data['jobs']
+        elif isinstance(data, list):
+            jobs_data = data
+        else:
+            st.error("Unexpected JSON structure")
+            return pd.DataFrame()
+
+        df = pd.DataFrame(jobs_data)
+
+        return clean_jobs_frame(df)
+
+    except Exception as e:
+        st.error(f"Error loading JSON: {e}")
+        return pd.DataFrame()
+
+
+def load_data(file_path, file_type, file_mtime):
+    """Dispatch to the cached loader for the file type"""
+    if file_type == 'csv':
+        return load_data_from_csv(file_path, file_mtime)
+    return load_data_from_json(file_path, file_mtime)
+
+
+class SidebarOptions(NamedTuple):
+    """Choices for the sidebar filters; None when the column is missing"""
+    companies: Optional[list]
+    locations: Optional[list]
+    keywords: Optional[list]
+    salary_bounds: Optional[tuple]
+
+
+@st.cache_data(show_spinner=False)
+def load_sidebar_options(file_path, file_type, file_mtime):
+    """Sidebar filter choices, computed once per data file"""
+    df = load_data(file_path, file_type, file_mtime)
+    companies = locations = keywords = salary_bounds = None
+    if 'company' in df.columns:
+        companies = [comp for comp in sorted_options(df['company']) if comp != 'Unknown']
+    if 'location' in df.columns:
+        locations = [loc for loc in sorted_options(df['location']) if loc != 'Unknown']
+    if 'search_keyword' in df.columns:
+        keywords = sorted_options(df['search_keyword'])
+    if 'salary_max' in df.columns and not df['salary_max'].isna().all():
+        salary_bounds = (int(df['salary_max'].min()), int(df['salary_max'].max()))
+    return SidebarOptions(companies, locations, keywords, salary_bounds)
+
+
+def filter_jobs(df, company, location, keyword, salary_range):
+    """Apply the sidebar filters as one boolean mask, no intermediate copies"""
+    mask = pd.Series(True, index=df.index)
+
+    if company != 'All':
+        mask &= df['company'] == company
+
+    if location != 'All':
+        mask &= df['location'] == location
+
+    if keyword != 'All' and 'search_keyword' in df.columns:
+        mask &= df['search_keyword'] == keyword
+
+    if salary_range and 'salary_max' in df.columns:
+        mask &= df['salary_max'].between(salary_range[0], salary_range[1])
+
+    return df[mask]
+
+
+class ChartAggregates(NamedTuple):
+    """Per-filter aggregates shared by the metrics and charts; None when
+    the underlying column is missing"""
+    avg_salary: Optional[float]
+    company_counts: Optional[pd.Series]
+    location_counts: Optional[pd.Series]
+    keyword_counts: Optional[pd.Series]
+    salary_by_keyword: Optional[pd.Series]
+
+
+@st.cache_data(show_spinner=False)
+def compute_aggregates(file_path, file_type, file_mtime, company, location, keyword, salary_range):
+    """Counts and means for the current filters, each computed in one pass
+    and reused for both the metric cards and the charts"""
+    filtered_df = filter_jobs(load_data(file_path, file_type, file_mtime),
+                              company, location, keyword, salary_range)
+    columns = filtered_df.columns
+
+    avg_salary = None
+    if 'salary_max' in columns and not filtered_df['salary_max'].isna().all():
+        avg_salary = float(filtered_df['salary_max'].mean())
+
+    company_counts = top_counts(filtered_df['company'], exclude='Unknown') if 'company' in columns else None
+    location_counts = top_counts(filtered_df['location'], exclude='Unknown') if 'location' in columns else None
+
+    keyword_counts = salary_by_keyword = None
+    if 'search_keyword' in columns:
+        keyword_counts = top_counts(filtered_df['search_keyword'])
+        if 'salary_max' in columns:
+            salary_by_keyword = filtered_df.groupby('search_keyword', observed=True)['salary_max'].mean().sort_values(ascending=False)
+
+    return ChartAggregates(avg_salary, company_counts, location_counts, keyword_counts, salary_by_keyword)
+
+
+# Skill -> keyword alternatives (longest first so "node.js" wins over "js")
+SKILL_KEYWORDS = {
+    'Python': ['python', 'py'],
+    'SQL': ['postgresql', 'postgres', 'mysql', 'sql'],
+    'AWS': ['amazon web services', 'aws'],
+    'JavaScript': ['javascript', 'node.js', 'nodejs', 'js'],
+    'React': ['reactjs', 'react'],
+    'Java': ['java'],
+    'Docker': ['docker', 'container'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    'Machine Learning': ['machine learning', 'ml', 'ai'],
+    'Tableau': ['tableau'],
+    'Power BI': ['power bi', 'powerbi'],
+    'Excel': ['excel'],
+    'Git': ['github', 'git'],
+    'Linux': ['linux', 'unix'],
+    'Spark': ['apache spark', 'spark']
+}
+
+# One whole-word alternation with a capturing group per skill, so a single
+# pass over the text tallies every skill (m.lastindex identifies the skill)
+SKILL_NAMES = list(SKILL_KEYWORDS)
+SKILL_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(
+        '(' + '|'.join(re.escape(keyword) for keyword in keywords) + ')'
+        for keywords in SKILL_KEYWORDS.values()
+    ) + r')\b',
+    re.IGNORECASE
+)
+
+
+@st.cache_data(show_spinner=False)
+def compute_skill_counts(file_path, file_type, file_mtime, company, location, keyword, salary_range):
+    """Skill mentions for the current filters; keyed on the file version and
+    the filter values like compute_aggregates, so a hit never hashes the frame"""
+    return extract_skills_from_text(filter_jobs(load_data(file_path, file_type, file_mtime),
+                                                company, location, keyword, salary_range))
+
+
+def extract_skills_from_text(df):
+    """Extract skills from job titles and descriptions"""
+    # Combine text from title and description columns
+    text_columns = []
+    if 'title' in df.columns:
+        text_columns.append('title')
+    if 'description' in df.columns:
+        text_columns.append('description')
+
+    if not text_columns:
+        return {}
+
+    # Combine all text
+    all_text = ' '.join(
+        ' '.join(df[col].fillna('').astype(str)) for col in text_columns
+    )
+
+    hits = Counter(m.lastindex for m in SKILL_PATTERN.finditer(all_text))
+    return {SKILL_NAMES[index - 1]: count for index, count in hits.items()}
+
 
 class JobMarketDashboard:
     """
@@ -47,185 +394,28 @@ class JobMarketDashboard:
         </style>
         """, unsafe_allow_html=True)
     
-    def find_latest_data_file(self):
-        """Find the most recent data file (CSV or JSON)"""
-        # Look for specific CSV files first
-        csv_files = glob.glob("data/jobs_analysis_*.csv")
-        json_files = glob.glob("data/comprehensive_job_data_*.json")
-        
-        if csv_files:
-            latest_csv = sorted(csv_files)[-1]
-            return latest_csv, 'csv'
-        elif json_files:
-            latest_json = sorted(json_files)[-1]
-            return latest_json, 'json'
-        else:
-            # Fallback to any CSV or JSON in data folder
-            all_csvs = glob.glob("data/*.csv")
-            all_jsons = glob.glob("data/*.json")
-            
-            if all_csvs:
-                return sorted(all_csvs)[-1], 'csv'
-            elif all_jsons:
-                return sorted(all_jsons)[-1], 'json'
-            else:
-                return None, None
-    
-    def load_data_from_csv(self, file_path):
-        """Load data from CSV file with proper column mapping"""
-        try:
-            df = pd.read_csv(file_path)
-            
-            # Map your actual column names to standard names
-            column_mapping = {
-                'company_name': 'company',
-                'location_display': 'location',
-                'category_label': 'category'
-            }
-            
-            # Apply column mapping
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    df[new_col] = df[old_col]
-            
-            # Clean and standardize numeric columns
-            if 'salary_max' in df.columns:
-                df['salary_max'] = pd.to_numeric(df['salary_max'], errors='coerce')
-            if 'salary_min' in df.columns:
-                df['salary_min'] = pd.to_numeric(df['salary_min'], errors='coerce')
-            
-            # Clean text columns
-            text_columns = ['title', 'company', 'location', 'category']
-            for col in text_columns:
-                if col in df.columns:
-                    df[col] = df[col].fillna('Unknown').astype(str)
-            
-            # Filter out unrealistic salaries
-            if 'salary_max' in df.columns:
-                df = df[(df['salary_max'] > 1000) & (df['salary_max'] < 1000000)]
-            
-            return df
-            
-        except Exception as e:
-            st.error(f"Error loading CSV: {e}")
-            return pd.DataFrame()
-    
-    def load_data_from_json(self, file_path):
-        """Load data from JSON file"""
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Extract jobs data
-            if isinstance(data, dict) and 'jobs' in data:
-                jobs_data = data['jobs']
-            elif isinstance(data, list):
-                jobs_data = data
-            else:
-                st.error("Unexpected JSON structure")
-                return pd.DataFrame()
-            
-            df = pd.DataFrame(jobs_data)
-            
-            # Map column names
-            column_mapping = {
-                'company_name': 'company',
-                'location_display': 'location',
-                'category_label': 'category'
-            }
-            
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    df[new_col] = df[old_col]
-            
-            # Clean numeric columns
-            if 'salary_max' in df.columns:
-                df['salary_max'] = pd.to_numeric(df['salary_max'], errors='coerce')
-            if 'salary_min' in df.columns:
-                df['salary_min'] = pd.to_numeric(df['salary_min'], errors='coerce')
-            
-            # Clean text columns
-            text_columns = ['title', 'company', 'location', 'category']
-            for col in text_columns:
-                if col in df.columns:
-                    df[col] = df[col].fillna('Unknown').astype(str)
-            
-            # Filter out unrealistic salaries
-            if 'salary_max' in df.columns:
-                df = df[(df['salary_max'] > 1000) & (df['salary_max'] < 1000000)]
-            
-            return df
-            
-        except Exception as e:
-            st.error(f"Error loading JSON: {e}")
-            return pd.DataFrame()
-    
-    def extract_skills_from_text(self, df):
-        """Extract skills from job titles and descriptions"""
-        skills_dict = {
-            'Python': ['python', 'py'],
-            'SQL': ['sql', 'mysql', 'postgresql', 'postgres'],
-            'AWS': ['aws', 'amazon web services'],
-            'JavaScript': ['javascript', 'js', 'node.js', 'nodejs'],
-            'React': ['react', 'reactjs'],
-            'Java': [' java ', 'java,', 'java.'],
-            'Docker': ['docker', 'container'],
-            'Kubernetes': ['kubernetes', 'k8s'],
-            'Machine Learning': ['machine learning', 'ml', 'ai'],
-            'Tableau': ['tableau'],
-            'Power BI': ['power bi', 'powerbi'],
-            'Excel': ['excel'],
-            'Git': ['git', 'github'],
-            'Linux': ['linux', 'unix'],
-            'Spark': ['spark', 'apache spark']
-        }
-        
-        # Combine text from title and description columns
-        text_columns = []
-        if 'title' in df.columns:
-            text_columns.append('title')
-        if 'description' in df.columns:
-            text_columns.append('description')
-        
-        if not text_columns:
-            return {}
-        
-        # Combine all text
-        all_text = ''
-        for col in text_columns:
-            all_text += ' ' + ' '.join(df[col].fillna('').astype(str))
-        
-        all_text = all_text.lower()
-        
-        skill_counts = {}
-        for skill, keywords in skills_dict.items():
-            count = sum(all_text.count(keyword) for keyword in keywords)
-            if count > 0:
-                skill_counts[skill] = count
-        
-        return skill_counts
-    
     def run_dashboard(self):
         """Main dashboard application"""
         st.title("💼 Job Market Analytics Dashboard")
         st.markdown("*Real-time insights from job market data*")
         
         # Load data
-        file_path, file_type = self.find_latest_data_file()
+        try:
+            file_path, file_type = find_latest_data_file(os.stat(DATA_DIR).st_mtime_ns)
+        except FileNotFoundError:
+            file_path, file_type = None, None
         
         if not file_path:
             st.error("No data files found! Please ensure you have CSV or JSON files in the 'data' folder.")
-            st.info("Expected files: `data/jobs_analysis_*.csv` or `data/comprehensive_job_data_*.json`")
+            st.info("Expected files: `data/jobs_analysis_*.csv` or `data/comprehensive_job_data_*.json[l]`")
             return
         
         # Show data source
         st.info(f"📁 Using data from: `{os.path.basename(file_path)}` ({file_type.upper()})")
         
         # Load data based on file type
-        if file_type == 'csv':
-            df = self.load_data_from_csv(file_path)
-        else:
-            df = self.load_data_from_json(file_path)
+        file_mtime = os.path.getmtime(file_path)
+        df = load_data(file_path, file_type, file_mtime)
         
         if df.empty:
             st.error("No data could be loaded from the file.")
@@ -242,58 +432,47 @@ class JobMarketDashboard:
         
         # Sidebar filters
         st.sidebar.header("🔍 Filters")
-        
-        # Company filter
-        if 'company' in df.columns:
-            companies = ['All'] + sorted([comp for comp in df['company'].dropna().unique() if comp != 'Unknown'])
-            selected_company = st.sidebar.selectbox("Company", companies)
-        else:
-            selected_company = 'All'
-        
-        # Location filter
-        if 'location' in df.columns:
-            locations = ['All'] + sorted([loc for loc in df['location'].dropna().unique() if loc != 'Unknown'])
-            selected_location = st.sidebar.selectbox("Location", locations)
-        else:
-            selected_location = 'All'
-        
-        # Search keyword filter
-        if 'search_keyword' in df.columns:
-            keywords = ['All'] + sorted(df['search_keyword'].dropna().unique().tolist())
-            selected_keyword = st.sidebar.selectbox("Job Type", keywords)
-        else:
-            selected_keyword = 'All'
-        
-        # Salary range filter
-        if 'salary_max' in df.columns and not df['salary_max'].isna().all():
-            min_salary = int(df['salary_max'].min())
-            max_salary = int(df['salary_max'].max())
-            salary_range = st.sidebar.slider(
-                "Salary Range ($)",
-                min_value=min_salary,
-                max_value=max_salary,
-                value=(min_salary, max_salary)
-            )
-        else:
-            salary_range = None
+        options = load_sidebar_options(file_path, file_type, file_mtime)
+        
+        # Widgets inside a form only rerun the script when the form is
+        # submitted, not on every intermediate selection
+        with st.sidebar.form("filters"):
+            # Company filter
+            if options.companies is not None:
+                selected_company = st.selectbox("Company", ['All'] + options.companies)
+            else:
+                selected_company = 'All'
+            
+            # Location filter
+            if options.locations is not None:
+                selected_location = st.selectbox("Location", ['All'] + options.locations)
+            else:
+                selected_location = 'All'
+            
+            # Search keyword filter
+            if options.keywords is not None:
+                selected_keyword = st.selectbox("Job Type", ['All'] + options.keywords)
+            else:
+                selected_keyword = 'All'
+            
+            # Salary range filter
+            if options.salary_bounds is not None:
+                min_salary, max_salary = options.salary_bounds
+                salary_range = st.slider(
+                    "Salary Range ($)",
+                    min_value=min_salary,
+                    max_value=max_salary,
+                    value=(min_salary, max_salary)
+                )
+            else:
+                salary_range = None
+            
+            st.form_submit_button("Apply filters")
         
         # Apply filters
-        filtered_df = df.copy()
-        
-        if selected_company != 'All':
-            filtered_df = filtered_df[filtered_df['company'] == selected_company]
-        
-        if selected_location != 'All':
-            filtered_df = filtered_df[filtered_df['location'] == selected_location]
-        
-        if selected_keyword != 'All' and 'search_keyword' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['search_keyword'] == selected_keyword]
-        
-        if salary_range and 'salary_max' in filtered_df.columns:
-            filtered_df = filtered_df[
-                (filtered_df['salary_max'] >= salary_range[0]) & 
-                (filtered_df['salary_max'] <= salary_range[1])
-            ]
+        filters = (selected_company, selected_location, selected_keyword, salary_range)
+        filtered_df = filter_jobs(df, *filters)
+        aggregates = compute_aggregates(file_path, file_type, file_mtime, *filters)
         
         # Key Metrics
         st.subheader("📊 Key Metrics")
@@ -303,23 +482,20 @@ class JobMarketDashboard:
             st.metric("Total Jobs", f"{len(filtered_df):,}")
         
         with col2:
-            if 'salary_max' in filtered_df.columns and not filtered_df['salary_max'].isna().all():
-                avg_salary = filtered_df['salary_max'].mean()
-                st.metric("Avg Max Salary", f"${avg_salary:,.0f}")
+            if aggregates.avg_salary is not None:
+                st.metric("Avg Max Salary", f"${aggregates.avg_salary:,.0f}")
             else:
                 st.metric("Avg Salary", "No data")
         
         with col3:
-            if 'company' in filtered_df.columns:
-                unique_companies = filtered_df[filtered_df['company'] != 'Unknown']['company'].nunique()
-                st.metric("Companies", f"{unique_companies:,}")
+            if aggregates.company_counts is not None:
+                st.metric("Companies", f"{len(aggregates.company_counts):,}")
             else:
                 st.metric("Companies", "No data")
         
         with col4:
-            if 'location' in filtered_df.columns:
-                unique_locations = filtered_df[filtered_df['location'] != 'Unknown']['location'].nunique()
-                st.metric("Locations", f"{unique_locations:,}")
+            if aggregates.location_counts is not None:
+                st.metric("Locations", f"{len(aggregates.location_counts):,}")
             else:
                 st.metric("Locations", "No data")
         
@@ -328,17 +504,21 @@ class JobMarketDashboard:
         
         with col1:
             st.subheader("🏢 Top Hiring Companies")
-            if 'company' in filtered_df.columns and len(filtered_df) > 0:
-                company_counts = filtered_df[filtered_df['company'] != 'Unknown']['company'].value_counts().head(10)
+            if aggregates.company_counts is not None and len(filtered_df) > 0:
+                company_counts = aggregates.company_counts.head(10)
                 if len(company_counts) > 0:
-                    fig = px.bar(
+                    fig = go.Figure(go.Bar(
                         x=company_counts.values,
-                        y=company_counts.index,
-                        orientation='h',
+                        y=company_counts.index.tolist(),
+                        orientation='h'
+                    ))
+                    fig.update_layout(
                         title="Companies with Most Job Postings",
-                        labels={'x': 'Number of Jobs', 'y': 'Company'}
+                        xaxis_title="Number of Jobs",
+                        yaxis_title="Company",
+                        height=400,
+                        showlegend=False
                     )
-                    fig.update_layout(height=400, showlegend=False)
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No company data available")
@@ -350,13 +530,20 @@ class JobMarketDashboard:
             if 'salary_max' in filtered_df.columns and not filtered_df['salary_max'].isna().all():
                 salary_data = filtered_df['salary_max'].dropna()
                 if len(salary_data) > 0:
-                    fig = px.histogram(
-                        x=salary_data,
-                        nbins=20,
+                    # Bin server-side: only the 20 bars go to the browser
+                    counts, edges = np.histogram(salary_data.to_numpy(dtype=np.float64), bins=20)
+                    fig = go.Figure(go.Bar(
+                        x=(edges[:-1] + edges[1:]) / 2,
+                        y=counts,
+                        width=np.diff(edges)
+                    ))
+                    fig.update_layout(
                         title="Salary Distribution",
-                        labels={'x': 'Salary ($)', 'y': 'Number of Jobs'}
+                        xaxis_title="Salary ($)",
+                        yaxis_title="Number of Jobs",
+                        height=400,
+                        showlegend=False
                     )
-                    fig.update_layout(height=400, showlegend=False)
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No salary data available")
@@ -368,15 +555,14 @@ class JobMarketDashboard:
         
         with col1:
             st.subheader("📍 Geographic Distribution")
-            if 'location' in filtered_df.columns and len(filtered_df) > 0:
-                location_counts = filtered_df[filtered_df['location'] != 'Unknown']['location'].value_counts().head(10)
+            if aggregates.location_counts is not None and len(filtered_df) > 0:
+                location_counts = aggregates.location_counts.head(10)
                 if len(location_counts) > 0:
-                    fig = px.pie(
+                    fig = go.Figure(go.Pie(
                         values=location_counts.values,
-                        names=location_counts.index,
-                        title="Jobs by Location"
-                    )
-                    fig.update_layout(height=400)
+                        labels=location_counts.index.tolist()
+                    ))
+                    fig.update_layout(title="Jobs by Location", height=400)
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No location data available")
@@ -385,54 +571,65 @@ class JobMarketDashboard:
         
         with col2:
             st.subheader("🛠️ Skills Demand")
-            skills = self.extract_skills_from_text(filtered_df)
+            skills = compute_skill_counts(file_path, file_type, file_mtime, *filters)
             
             if skills:
-                skills_df = pd.DataFrame(list(skills.items()), columns=['Skill', 'Mentions'])
-                skills_df = skills_df.sort_values('Mentions', ascending=False).head(10)
+                top_skills = sorted(skills.items(), key=lambda item: item[1], reverse=True)[:10]
+                skill_names, mentions = zip(*top_skills)
                 
-                fig = px.bar(
-                    skills_df,
-                    x='Mentions',
-                    y='Skill',
-                    orientation='h',
+                fig = go.Figure(go.Bar(
+                    x=mentions,
+                    y=skill_names,
+                    orientation='h'
+                ))
+                fig.update_layout(
                     title="Most Mentioned Skills",
-                    labels={'Mentions': 'Number of Mentions', 'Skill': 'Skill'}
+                    xaxis_title="Number of Mentions",
+                    yaxis_title="Skill",
+                    height=400,
+                    showlegend=False
                 )
-                fig.update_layout(height=400, showlegend=False)
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No skills data could be extracted")
         
         # Charts Row 3
-        if 'search_keyword' in filtered_df.columns:
+        if aggregates.keyword_counts is not None:
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("🎯 Job Categories")
-                keyword_counts = filtered_df['search_keyword'].value_counts()
+                keyword_counts = aggregates.keyword_counts
                 if len(keyword_counts) > 0:
-                    fig = px.bar(
-                        x=keyword_counts.index,
-                        y=keyword_counts.values,
+                    fig = go.Figure(go.Bar(
+                        x=keyword_counts.index.tolist(),
+                        y=keyword_counts.values
+                    ))
+                    fig.update_layout(
                         title="Jobs by Search Keyword",
-                        labels={'x': 'Job Type', 'y': 'Number of Jobs'}
+                        xaxis_title="Job Type",
+                        yaxis_title="Number of Jobs",
+                        height=400,
+                        showlegend=False
                     )
-                    fig.update_layout(height=400, showlegend=False)
                     st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                if 'salary_max' in filtered_df.columns:
+                if aggregates.salary_by_keyword is not None:
                     st.subheader("💵 Salary by Job Type")
-                    salary_by_keyword = filtered_df.groupby('search_keyword')['salary_max'].mean().sort_values(ascending=False)
+                    salary_by_keyword = aggregates.salary_by_keyword
                     if len(salary_by_keyword) > 0:
-                        fig = px.bar(
-                            x=salary_by_keyword.index,
-                            y=salary_by_keyword.values,
+                        fig = go.Figure(go.Bar(
+                            x=salary_by_keyword.index.tolist(),
+                            y=salary_by_keyword.values
+                        ))
+                        fig.update_layout(
                             title="Average Salary by Job Type",
-                            labels={'x': 'Job Type', 'y': 'Average Salary ($)'}
+                            xaxis_title="Job Type",
+                            yaxis_title="Average Salary ($)",
+                            height=400,
+                            showlegend=False
                         )
-                        fig.update_layout(height=400, showlegend=False)
                         st.plotly_chart(fig, use_container_width=True)
         
         # Data Table
@@ -461,10 +658,10 @@ class JobMarketDashboard:
                     page = st.selectbox("Page", range(1, total_pages + 1))
                     start_idx = (page - 1) * page_size
                     end_idx = min(start_idx + page_size, total_rows)
-                    display_data = filtered_df[selected_columns].iloc[start_idx:end_idx]
+                    display_data = page_slice(filtered_df, selected_columns, start_idx, end_idx)
                     st.caption(f"Showing {start_idx + 1}-{end_idx} of {total_rows} jobs")
                 else:
-                    display_data = filtered_df[selected_columns]
+                    display_data = page_slice(filtered_df, selected_columns)
                 
                 st.dataframe(display_data, use_container_width=True)
         
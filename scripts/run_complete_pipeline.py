@@ -8,6 +8,7 @@ import logging
 import sys
 import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict
 
@@ -30,74 +31,41 @@ def setup_logging():
         ]
     )
 
-def create_analytics_views():
-    """Create analytics views in SQLite"""
-    from config.settings import Settings
-    settings = Settings()
+def create_analytics_views(rebuild=False):
+    """Create the staging view and materialized analytics tables in SQLite"""
+    from config.settings import get_settings
+    from analytics.apply_views_to_existing_data import apply_analytics
+    settings = get_settings()
     
-    sql_commands = """
-    CREATE VIEW IF NOT EXISTS stg_jobs AS
-    SELECT 
-        id, title, company, location,
-        CAST(salary_min AS REAL) as salary_min,
-        CAST(salary_max AS REAL) as salary_max,
-        seniority_level, skills_extracted, is_remote,
-        location_city, location_state, location_country,
-        search_keyword, search_location,
-        DATE(created) as job_posted_date,
-        DATE(extracted_at) as data_extracted_date
-    FROM raw_jobs
-    WHERE salary_max > 1000;
+    # Same definitions as analytics/apply_views_to_existing_data.py:
+    # dim_companies and skills_analysis are tables kept current by
+    # triggers and incremental refreshes instead of views over raw_jobs
+    with sqlite3.connect(settings.DATABASE_PATH) as conn:
+        apply_analytics(conn, rebuild=rebuild)
 
-    CREATE VIEW IF NOT EXISTS dim_companies AS
-    SELECT 
-        company,
-        COUNT(*) as total_jobs_posted,
-        AVG(salary_max) as avg_max_salary,
-        MIN(DATE(created)) as first_job_posted,
-        MAX(DATE(created)) as last_job_posted
-    FROM stg_jobs 
-    GROUP BY company
-    HAVING COUNT(*) >= 2;
+# One JobTransformer per worker process, built by the pool initializer
+_worker_transformer = None
 
-    CREATE VIEW IF NOT EXISTS skills_analysis AS
-    SELECT 
-        TRIM(skill_name) as skill_name,
-        COUNT(*) as job_count,
-        AVG(salary_max) as avg_salary,
-        seniority_level
-    FROM (
-        SELECT 
-            CASE 
-                WHEN skills_extracted LIKE '%python%' THEN 'python'
-                WHEN skills_extracted LIKE '%sql%' THEN 'sql'  
-                WHEN skills_extracted LIKE '%aws%' THEN 'aws'
-                WHEN skills_extracted LIKE '%java%' THEN 'java'
-                WHEN skills_extracted LIKE '%react%' THEN 'react'
-                WHEN skills_extracted LIKE '%javascript%' THEN 'javascript'
-            END as skill_name,
-            salary_max, seniority_level
-        FROM stg_jobs
-        WHERE skills_extracted IS NOT NULL
-    ) skills
-    WHERE skill_name IS NOT NULL
-    GROUP BY skill_name, seniority_level;
-    """
-    
-    with sqlite3.connect(settings.DATABASE_PATH) as conn:
-        for statement in sql_commands.split(';'):
-            statement = statement.strip()
-            if statement:
-                conn.execute(statement)
-        conn.commit()
+def _init_transform_worker():
+    global _worker_transformer
+    _worker_transformer = JobTransformer()
+
+def _transform_job(job):
+    """Skills, seniority and remote flag for one (title, description, location)"""
+    title, description, location = job
+    transformer = _worker_transformer
+    skills = transformer.extract_skills(description or "")
+    seniority = transformer.classify_seniority(title or "", description or "")
+    is_remote = transformer.is_remote_job(title or "", description or "", location or "")
+    return ','.join(skills), seniority, is_remote
 
 def apply_transformations():
     """Apply job transformations to database"""
-    from config.settings import Settings
-    settings = Settings()
-    transformer = JobTransformer()
+    from config.settings import get_settings
+    settings = get_settings()
     
-    with sqlite3.connect(settings.DATABASE_PATH) as conn:
+    with sqlite3.connect(settings.DATABASE_PATH) as conn, \
+            ProcessPoolExecutor(initializer=_init_transform_worker) as executor:
         # Add transformation columns if they don't exist
         try:
             conn.execute("ALTER TABLE raw_jobs ADD COLUMN skills_extracted TEXT")
@@ -109,38 +77,69 @@ def apply_transformations():
         except sqlite3.OperationalError:
             pass  # Columns already exist
         
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        # Pending rows are found through a partial index, not a table scan
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_raw_jobs_skills_null
+            ON raw_jobs(id) WHERE skills_extracted IS NULL
+        """)
+        
+        # Take the write lock up front: the whole pass is one transaction
+        conn.execute("BEGIN IMMEDIATE")
+        
+        # Simple location parsing in one SQL pass: city and state are the
+        # first two comma-separated parts, country is the last part when
+        # there are more than two, else 'US'
+        conn.execute("""
+            UPDATE raw_jobs
+            SET location_city = CASE WHEN location <> ''
+                    THEN TRIM(SUBSTR(location, 1, INSTR(location || ',', ',') - 1)) END,
+                location_state = CASE WHEN INSTR(location, ',') > 0
+                    THEN TRIM(SUBSTR(location, INSTR(location, ',') + 1,
+                                     INSTR(SUBSTR(location, INSTR(location, ',') + 1) || ',', ',') - 1)) END,
+                location_country = CASE WHEN LENGTH(location) - LENGTH(REPLACE(location, ',', '')) >= 2
+                    THEN TRIM(SUBSTR(location, LENGTH(RTRIM(location, REPLACE(location, ',', ''))) + 1))
+                    ELSE 'US' END
+            WHERE skills_extracted IS NULL
+        """)
+        
         # Get jobs that need transformation
         cursor = conn.cursor()
-        cursor.execute("SELECT id, title, description, location FROM raw_jobs WHERE skills_extracted IS NULL LIMIT 1000")
-        jobs = cursor.fetchall()
+        cursor.arraysize = 1000
+        cursor.execute("SELECT id, title, description, location FROM raw_jobs WHERE skills_extracted IS NULL")
         
-        print(f"Applying transformations to {len(jobs)} jobs...")
-        
-        for i, (job_id, title, description, location) in enumerate(jobs):
-            if i % 100 == 0:
-                print(f"Processed {i} jobs...")
+        updates = []
+        while True:
+            jobs = cursor.fetchmany()
+            if not jobs:
+                break
             
-            # Apply transformations
-            skills = transformer.extract_skills(description or "")
-            seniority = transformer.classify_seniority(title or "", description or "")
-            is_remote = transformer.is_remote_job(title or "", description or "", location or "")
+            # Apply transformations across all cores (CPU-bound regex work)
+            results = executor.map(
+                _transform_job,
+                [(title, description, location) for _, title, description, location in jobs],
+                chunksize=50
+            )
             
-            # Simple location parsing
-            location_parts = location.split(',') if location else []
-            city = location_parts[0].strip() if location_parts else None
-            state = location_parts[1].strip() if len(location_parts) > 1 else None
-            country = location_parts[-1].strip() if len(location_parts) > 2 else 'US'
+            for (job_id, *_), (skills, seniority, is_remote) in zip(jobs, results):
+                updates.append((skills, seniority, is_remote, job_id))
             
-            # Update database
-            cursor.execute("""
-                UPDATE raw_jobs 
-                SET skills_extracted = ?, seniority_level = ?, is_remote = ?,
-                    location_city = ?, location_state = ?, location_country = ?
-                WHERE id = ?
-            """, (','.join(skills), seniority, is_remote, city, state, country, job_id))
+            print(f"Processed {len(updates)} jobs...")
+        
+        print(f"Applying transformations to {len(updates)} jobs...")
+        
+        # Update database in one batch
+        cursor.executemany("""
+            UPDATE raw_jobs 
+            SET skills_extracted = ?, seniority_level = ?, is_remote = ?
+            WHERE id = ?
+        """, updates)
         
         conn.commit()
-        print(f"✅ Applied transformations to {len(jobs)} jobs")
+        print(f"✅ Applied transformations to {len(updates)} jobs")
 
 def run_complete_pipeline():
     """Run the complete data pipeline"""
@@ -148,37 +147,29 @@ def run_complete_pipeline():
     logger.info("Starting complete pipeline run")
     
     try:
-        # Step 1: Extract data
+        # Steps 1-2: Extract job data and stream it straight into SQLite
         logger.info("Step 1: Extracting job data from API")
         extractor = AdzunaExtractor()
         
-        all_jobs = []
         searches = [
             {"what": "data engineer", "location": "paris", "max_pages": 3},
             {"what": "data scientist", "location": "london", "max_pages": 2},
         ]
         
-        for search in searches:
-            jobs = extractor.extract_jobs(**search)
-            all_jobs.extend(jobs)
-            logger.info(f"Extracted {len(jobs)} jobs for {search['what']} in {search['location']}")
-        
-        logger.info(f"Total jobs extracted: {len(all_jobs)}")
-        
-        # Step 2: Load data
-        logger.info("Step 2: Loading data into SQLite")
+        logger.info("Step 2: Loading data into SQLite as it is extracted")
         loader = SQLiteLoader()
         loader.clear_database()  # Clear existing data
-        rows_inserted = loader.load_raw_jobs(all_jobs)
+        rows_inserted = loader.load_from_iterable(extractor.iter_jobs(searches))
         logger.info(f"Inserted {rows_inserted} rows")
         
         # Step 3: Apply transformations
         logger.info("Step 3: Applying data transformations")
         apply_transformations()
         
-        # Step 4: Create analytics views
+        # Step 4: Create analytics views; raw_jobs was cleared and reloaded
+        # above, so the aggregates are rebuilt rather than folded forward
         logger.info("Step 4: Creating analytics views")
-        create_analytics_views()
+        create_analytics_views(rebuild=True)
         
         # Step 5: Generate statistics
         logger.info("Step 5: Generating pipeline statistics")
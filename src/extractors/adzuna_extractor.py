@@ -1,10 +1,180 @@
-import requests
+import asyncio
+import aiohttp
+import hashlib
+import json
+import queue
+import threading
 import time
 import logging
-from typing import List, Dict, Optional
-from config.settings import Settings
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional
+from urllib.parse import urlencode
+from config.settings import get_settings
 import os
 
+try:
+    import redis
+except ImportError:  # Redis is optional; responses are cached on disk only
+    redis = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json reads and writes the same data, only slower
+    orjson = None
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# Seconds a cached response stays fresh, by endpoint (the path segment after /jobs/{country}/)
+CACHE_TTLS = {
+    'search': 60 * 60,
+    'histogram': 6 * 60 * 60,
+    'top_companies': 6 * 60 * 60,
+    'geodata': 6 * 60 * 60,
+    'categories': 24 * 60 * 60,
+    'history': 24 * 60 * 60,
+}
+
+# Request params that identify the caller rather than the query; left out of
+# cache keys so rotating credentials keeps the cache and no file name derives
+# from a secret
+CREDENTIAL_PARAMS = {'app_id', 'app_key'}
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket paced by the API's own rate-limit headers
+    
+    Bursts up to `capacity` requests go out without waiting; beyond that
+    requests are spaced at `refill_rate` per second. X-RateLimit-Limit /
+    X-RateLimit-Remaining shrink the bucket to what the server says is left,
+    and Retry-After holds every request until the server is ready again.
+    """
+    
+    def __init__(self, refill_rate: float, capacity: int):
+        self.refill_rate = refill_rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+    
+    async def acquire(self):
+        """Take one token, sleeping only while the bucket is empty or blocked"""
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+    
+    def update(self, headers) -> None:
+        """Fold a response's rate-limit headers into the bucket"""
+        limit = self._header_number(headers, 'X-RateLimit-Limit')
+        if limit:
+            self.capacity = limit
+        
+        remaining = self._header_number(headers, 'X-RateLimit-Remaining')
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+        
+        retry_after = self._header_number(headers, 'Retry-After')
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+    
+    @staticmethod
+    def _header_number(headers, name: str) -> Optional[float]:
+        try:
+            return float(headers[name])
+        except (KeyError, ValueError):
+            return None
+
+# Transient HTTP statuses worth retrying; any other error status fails at once
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def to_json_line(obj) -> bytes:
+    """Serialize obj as one line of JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + '\n').encode()
+
+
+class ResponseCache:
+    """
+    JSON response cache keyed by SHA256(url + sorted params, minus credentials)
+    
+    Entries live as files under `cache_dir`, or in Redis when `redis_url`
+    is set and the redis package is installed. Expired entries are treated
+    as misses and overwritten on the next successful request; prune() deletes
+    files old enough that no TTL can still cover them. All methods block, so
+    async callers run them in a worker thread.
+    """
+    
+    def __init__(self, cache_dir: str, redis_url: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.redis = redis.Redis.from_url(redis_url) if redis_url and redis else None
+        if self.redis is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def key(url: str, params: Dict) -> str:
+        query = sorted((name, value) for name, value in params.items() if name not in CREDENTIAL_PARAMS)
+        return hashlib.sha256((url + urlencode(query)).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached body for key, or None when missing or stale"""
+        if self.redis is not None:
+            cached = self.redis.get(key)
+            return json.loads(cached) if cached else None
+        
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        
+        if time.time() - entry['stored_at'] > entry['ttl']:
+            return None
+        return entry['body']
+    
+    def set(self, key: str, body: Dict, ttl: int, status: int = 200) -> None:
+        if self.redis is not None:
+            self.redis.setex(key, ttl, json.dumps(body))
+            return
+        
+        entry = {'body': body, 'status': status, 'stored_at': time.time(), 'ttl': ttl}
+        # Write then rename, so a concurrent get never reads a partial file
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    
+    def prune(self, max_age: float) -> int:
+        """Delete disk entries (and stray temp files) last written more than
+        max_age seconds ago; Redis expires its keys itself. Returns the count"""
+        if self.redis is not None:
+            return 0
+        
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in ('.json', '.tmp'):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
 class AdzunaExtractor:
     """
     Enhanced Adzuna API extractor for comprehensive job market data
@@ -12,19 +182,26 @@ class AdzunaExtractor:
     Educational Notes:
     - Extracts jobs, salary data, top companies, and geographic insights
     - Multiple API endpoints for different types of analysis
+    - Requests are I/O bound, so they are issued concurrently with aiohttp
     - Comprehensive error handling and rate limiting
     """
     
     def __init__(self):
-        self.settings = Settings()
-        self.session = requests.Session()
+        self.settings = get_settings()
         self.logger = logging.getLogger(__name__)
+        self.cache = ResponseCache(self.settings.HTTP_CACHE_DIR, self.settings.REDIS_URL)
+        self.cache_hits = 0
+        self._limiter = AdaptiveLimiter(
+            refill_rate=1 / self.settings.RATE_LIMIT_DELAY,
+            capacity=self.settings.MAX_CONCURRENCY
+        )
     
     def extract_comprehensive_data(self, 
                                  country: str = "fr", 
                                  locations: List[str] = None,
                                  job_types: List[str] = None,
-                                 max_pages: int = 5) -> Dict:
+                                 max_pages: int = 5,
+                                 jobs_path: Optional[str] = None) -> Dict:
         """
         Extract comprehensive job market data including:
         - Job listings
@@ -32,6 +209,9 @@ class AdzunaExtractor:
         - Top companies
         - Geographic job distribution
         - Categories
+        
+        With jobs_path, job listings are streamed to that file as JSON lines
+        while extraction runs and 'jobs' is left empty.
         """
         if locations is None:
             locations = ["new york", "san francisco", "seattle", "austin", "boston"]
@@ -54,141 +234,245 @@ class AdzunaExtractor:
             }
         }
         
-        # 1. Extract job listings for each location and job type
-        self.logger.info("Starting job listings extraction...")
-        for location in locations:
-            for job_type in job_types:
-                jobs = self.extract_jobs(country, location, job_type, max_pages)
-                comprehensive_data['jobs'].extend(jobs)
-                time.sleep(self.settings.RATE_LIMIT_DELAY)
-        
-        # 2. Extract salary histograms for each job type
-        self.logger.info("Extracting salary histograms...")
-        for job_type in job_types:
-            histogram = self.extract_salary_histogram(country, job_type)
-            if histogram:
+        self.logger.info("Starting concurrent extraction of jobs, histograms, companies, geodata and categories...")
+        jobs, histograms, companies, geo_data, categories = asyncio.run(
+            self._with_session(self._extract_all, country, locations, job_types, max_pages, jobs_path)
+        )
+        
+        # 1. Job listings for each location and job type
+        if jobs_path is None:
+            for job_list in jobs:
+                if self._succeeded(job_list, "job listings"):
+                    comprehensive_data['jobs'].extend(job_list)
+            total_jobs = len(comprehensive_data['jobs'])
+        else:
+            total_jobs = jobs if self._succeeded(jobs, "job listings") else 0
+            comprehensive_data['extraction_metadata']['jobs_file'] = jobs_path
+            comprehensive_data['extraction_metadata']['jobs_count'] = total_jobs
+        
+        # 2. Salary histograms for each job type
+        for job_type, histogram in zip(job_types, histograms):
+            if self._succeeded(histogram, f"salary histogram for {job_type}") and histogram:
                 comprehensive_data['salary_histograms'].append({
                     'job_type': job_type,
                     'histogram_data': histogram
                 })
-            time.sleep(self.settings.RATE_LIMIT_DELAY)
         
-        # 3. Extract top companies for each job type
-        self.logger.info("Extracting top companies...")
-        for job_type in job_types:
-            companies = self.extract_top_companies(country, job_type)
-            if companies:
+        # 3. Top companies for each job type
+        for job_type, company_list in zip(job_types, companies):
+            if self._succeeded(company_list, f"top companies for {job_type}") and company_list:
                 comprehensive_data['top_companies'].append({
                     'job_type': job_type,
-                    'companies': companies
+                    'companies': company_list
                 })
-            time.sleep(self.settings.RATE_LIMIT_DELAY)
         
-        # 4. Extract geographic job distribution
-        self.logger.info("Extracting geographic data...")
-        for job_type in job_types:
-            geo_data = self.extract_geographic_data(country, job_type)
-            if geo_data:
+        # 4. Geographic job distribution
+        for job_type, locations_data in zip(job_types, geo_data):
+            if self._succeeded(locations_data, f"geographic data for {job_type}") and locations_data:
                 comprehensive_data['geographic_data'].append({
                     'job_type': job_type,
-                    'locations': geo_data
+                    'locations': locations_data
                 })
-            time.sleep(self.settings.RATE_LIMIT_DELAY)
         
-        # 5. Extract available categories
-        self.logger.info("Extracting job categories...")
-        categories = self.extract_categories(country)
-        comprehensive_data['categories'] = categories
+        # 5. Available categories
+        if self._succeeded(categories, "categories"):
+            comprehensive_data['categories'] = categories
         
-        self.logger.info(f"Comprehensive extraction complete. Total jobs: {len(comprehensive_data['jobs'])}")
+        self.logger.info(f"Comprehensive extraction complete. Total jobs: {total_jobs}")
+        self.logger.info(f"HTTP cache hits so far: {self.cache_hits}")
         return comprehensive_data
     
+    async def _extract_all(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, country: str,
+                           locations: List[str], job_types: List[str], max_pages: int,
+                           jobs_path: Optional[str] = None) -> tuple:
+        """Fire every endpoint sweep at once; each result list is in input order"""
+        searches = (self._extract_jobs(session, semaphore, country, location, job_type, max_pages)
+                    for location in locations for job_type in job_types)
+        job_sweep = self._gather(searches) if jobs_path is None else self._stream_jobs(searches, jobs_path)
+        
+        return await asyncio.gather(
+            job_sweep,
+            self._gather(self.extract_salary_histogram(session, semaphore, country, job_type) for job_type in job_types),
+            self._gather(self.extract_top_companies(session, semaphore, country, job_type) for job_type in job_types),
+            self._gather(self.extract_geographic_data(session, semaphore, country, job_type) for job_type in job_types),
+            self.extract_categories(session, semaphore, country),
+            return_exceptions=True
+        )
+    
+    async def _stream_jobs(self, searches, jobs_path: str) -> int:
+        """
+        Write each search's jobs to jobs_path as JSON lines as soon as it
+        finishes. A single writer task owns the file, so only the searches
+        still in flight are held in memory. Returns the number of jobs written.
+        """
+        pending = asyncio.Queue()
+        
+        async def fetch(search):
+            await pending.put(await search)
+        
+        async def write() -> int:
+            written = 0
+            with open(jobs_path, 'wb') as f:
+                while (jobs := await pending.get()) is not None:
+                    f.writelines(to_json_line(job) for job in jobs)
+                    written += len(jobs)
+            return written
+        
+        writer = asyncio.create_task(write())
+        for result in await self._gather(fetch(search) for search in searches):
+            self._succeeded(result, "job listings")
+        await pending.put(None)
+        return await writer
+    
+    @staticmethod
+    async def _gather(coros) -> list:
+        return await asyncio.gather(*coros, return_exceptions=True)
+    
+    def _succeeded(self, result, label: str) -> bool:
+        """False (and log) when a gathered call raised instead of returning"""
+        if isinstance(result, BaseException):
+            self.logger.error(f"Error extracting {label}: {result}")
+            return False
+        return True
+    
     def extract_jobs(self, 
                     country: str = "fr", 
                     location: str = "paris",
                     what: str = "data engineer",
                     max_pages: int = 5) -> List[Dict]:
         """Extract job postings with enhanced data fields"""
-        all_jobs = []
+        jobs = asyncio.run(self._with_session(self._extract_jobs, country, location, what, max_pages))
+        self.logger.info(f"HTTP cache hits so far: {self.cache_hits}")
+        return jobs
+    
+    def iter_jobs(self, searches: List[Dict], jobs_path: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yield enriched jobs for the searches while extraction is still running
         
-        for page in range(1, max_pages + 1):
-            self.logger.info(f"Fetching jobs page {page} for '{what}' in {location}")
-            
-            url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/search/{page}"
-            
-            params = {
-                'app_id': self.settings.ADZUNA_API_ID,
-                'app_key': self.settings.ADZUNA_API_KEY,
-                'results_per_page': 50,
-                'what': what,
-                'where': location,
-                'content-type': 'application/json',
-                'sort_by': 'relevance',
-                'salary_include_unknown': '1'  # Include jobs without salary info
-            }
-            
+        The searches run concurrently on a background event loop; each one's
+        jobs are handed over, in `searches` order, as soon as it and the
+        searches before it have finished, so a consumer such as
+        SQLiteLoader.load_from_iterable writes them while later searches are
+        still in flight and sees duplicates in the same order on every run.
+        With jobs_path, every yielded job is also teed to that file as a JSON
+        line.
+        """
+        finished = queue.Queue()
+        errors = []
+        
+        async def produce(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore):
+            tasks = [asyncio.create_task(self._extract_jobs(session, semaphore, **search)) for search in searches]
+            for task in tasks:
+                finished.put(await task)
+        
+        def worker():
             try:
-                response = self._make_request(url, params)
-                
-                if response and 'results' in response:
-                    jobs = response['results']
-                    self.logger.info(f"Fetched {len(jobs)} jobs from page {page}")
-                    
-                    # Enhance each job with additional metadata
-                    for job in jobs:
-                        job['extracted_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
-                        job['search_location'] = location
-                        job['search_keyword'] = what
-                        job['search_country'] = country
-                        
-                        # Extract company name safely
-                        if 'company' in job and job['company']:
-                            if isinstance(job['company'], dict):
-                                job['company_name'] = job['company'].get('display_name', 'Unknown')
-                                job['company_canonical'] = job['company'].get('canonical_name', '')
-                            else:
-                                job['company_name'] = str(job['company'])
-                                job['company_canonical'] = ''
-                        else:
-                            job['company_name'] = 'Unknown'
-                            job['company_canonical'] = ''
-                        
-                        # Extract location details
-                        if 'location' in job and job['location']:
-                            location_obj = job['location']
-                            job['location_display'] = location_obj.get('display_name', location)
-                            job['location_areas'] = location_obj.get('area', [])
-                        else:
-                            job['location_display'] = location
-                            job['location_areas'] = []
-                        
-                        # Extract category information
-                        if 'category' in job and job['category']:
-                            category_obj = job['category']
-                            job['category_label'] = category_obj.get('label', 'Unknown')
-                            job['category_tag'] = category_obj.get('tag', '')
-                        else:
-                            job['category_label'] = 'Unknown'
-                            job['category_tag'] = ''
-                    
-                    all_jobs.extend(jobs)
-                    
-                    # Check if we've reached the end
-                    if len(jobs) < 50:
-                        break
-                else:
-                    self.logger.warning(f"No results on page {page}")
-                    break
-                    
+                asyncio.run(self._with_session(produce))
             except Exception as e:
-                self.logger.error(f"Error fetching jobs page {page}: {e}")
-                break
+                errors.append(e)
+            finally:
+                finished.put(None)
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        
+        tee = open(jobs_path, 'wb') if jobs_path else None
+        try:
+            while (jobs := finished.get()) is not None:
+                if tee:
+                    tee.writelines(to_json_line(job) for job in jobs)
+                yield from jobs
+        finally:
+            if tee:
+                tee.close()
+        
+        thread.join()
+        self.logger.info(f"HTTP cache hits so far: {self.cache_hits}")
+        if errors:
+            raise errors[0]
+    
+    async def _extract_jobs(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, country: str = "fr",
+                            location: str = "paris", what: str = "data engineer",
+                            max_pages: int = 5) -> List[Dict]:
+        """Fetch all pages concurrently, then keep them up to the first short page"""
+        pages = await asyncio.gather(*(
+            self._extract_jobs_page(session, semaphore, country, location, what, page)
+            for page in range(1, max_pages + 1)
+        ))
+        
+        all_jobs = []
+        for jobs in pages:
+            all_jobs.extend(jobs)
             
-            time.sleep(self.settings.RATE_LIMIT_DELAY)
+            # Check if we've reached the end
+            if len(jobs) < 50:
+                break
         
         return all_jobs
     
-    def extract_salary_histogram(self, country: str, job_type: str) -> Optional[Dict]:
+    async def _extract_jobs_page(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, country: str,
+                                 location: str, what: str, page: int) -> List[Dict]:
+        """Fetch and enhance a single page of job postings"""
+        self.logger.info(f"Fetching jobs page {page} for '{what}' in {location}")
+        
+        url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/search/{page}"
+        
+        params = {
+            'app_id': self.settings.ADZUNA_API_ID,
+            'app_key': self.settings.ADZUNA_API_KEY,
+            'results_per_page': 50,
+            'what': what,
+            'where': location,
+            'content-type': 'application/json',
+            'sort_by': 'relevance',
+            'salary_include_unknown': '1'  # Include jobs without salary info
+        }
+        
+        try:
+            response = await self._make_request(session, semaphore, url, params)
+        except Exception as e:
+            self.logger.error(f"Error fetching jobs page {page}: {e}")
+            return []
+        
+        if not response or 'results' not in response:
+            self.logger.warning(f"No results on page {page}")
+            return []
+        
+        jobs = response['results']
+        self.logger.info(f"Fetched {len(jobs)} jobs from page {page}")
+        
+        # Enhance each job with additional metadata; the search fields and
+        # timestamp are the same for the whole page, so they are built once
+        search_fields = {
+            'extracted_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'search_location': location,
+            'search_keyword': what,
+            'search_country': country
+        }
+        for job in jobs:
+            job.update(search_fields)
+            
+            # Flatten company, location and category (missing or empty -> defaults)
+            company = job.get('company') or {}
+            if isinstance(company, dict):
+                job['company_name'] = company.get('display_name', 'Unknown')
+                job['company_canonical'] = company.get('canonical_name', '')
+            else:
+                job['company_name'] = str(company)
+                job['company_canonical'] = ''
+            
+            location_obj = job.get('location') or {}
+            job['location_display'] = location_obj.get('display_name', location)
+            job['location_areas'] = location_obj.get('area', [])
+            
+            category_obj = job.get('category') or {}
+            job['category_label'] = category_obj.get('label', 'Unknown')
+            job['category_tag'] = category_obj.get('tag', '')
+        
+        return jobs
+    
+    async def extract_salary_histogram(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                       country: str, job_type: str) -> Optional[Dict]:
         """Extract salary distribution data for a job type"""
         url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/histogram"
         
@@ -199,7 +483,7 @@ class AdzunaExtractor:
         }
         
         try:
-            response = self._make_request(url, params)
+            response = await self._make_request(session, semaphore, url, params)
             if response and 'histogram' in response:
                 return {
                     'job_type': job_type,
@@ -211,7 +495,8 @@ class AdzunaExtractor:
         
         return None
     
-    def extract_top_companies(self, country: str, job_type: str) -> Optional[List[Dict]]:
+    async def extract_top_companies(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                    country: str, job_type: str) -> Optional[List[Dict]]:
         """Extract top hiring companies for a job type"""
         url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/top_companies"
         
@@ -222,19 +507,21 @@ class AdzunaExtractor:
         }
         
         try:
-            response = self._make_request(url, params)
+            response = await self._make_request(session, semaphore, url, params)
             if response and 'leaderboard' in response:
                 companies = response['leaderboard']
+                extracted_at = time.strftime('%Y-%m-%d %H:%M:%S')
                 for company in companies:
                     company['job_type_searched'] = job_type
-                    company['extracted_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+                    company['extracted_at'] = extracted_at
                 return companies
         except Exception as e:
             self.logger.error(f"Error fetching top companies for {job_type}: {e}")
         
         return None
     
-    def extract_geographic_data(self, country: str, job_type: str) -> Optional[List[Dict]]:
+    async def extract_geographic_data(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                      country: str, job_type: str) -> Optional[List[Dict]]:
         """Extract geographic distribution of jobs"""
         url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/geodata"
         
@@ -245,19 +532,21 @@ class AdzunaExtractor:
         }
         
         try:
-            response = self._make_request(url, params)
+            response = await self._make_request(session, semaphore, url, params)
             if response and 'locations' in response:
                 locations = response['locations']
+                extracted_at = time.strftime('%Y-%m-%d %H:%M:%S')
                 for location in locations:
                     location['job_type_searched'] = job_type
-                    location['extracted_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+                    location['extracted_at'] = extracted_at
                 return locations
         except Exception as e:
             self.logger.error(f"Error fetching geographic data for {job_type}: {e}")
         
         return None
     
-    def extract_categories(self, country: str) -> Optional[List[Dict]]:
+    async def extract_categories(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                 country: str) -> Optional[List[Dict]]:
         """Extract all available job categories"""
         url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/categories"
         
@@ -267,18 +556,20 @@ class AdzunaExtractor:
         }
         
         try:
-            response = self._make_request(url, params)
+            response = await self._make_request(session, semaphore, url, params)
             if response and 'results' in response:
                 categories = response['results']
+                extracted_at = time.strftime('%Y-%m-%d %H:%M:%S')
                 for category in categories:
-                    category['extracted_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+                    category['extracted_at'] = extracted_at
                 return categories
         except Exception as e:
             self.logger.error(f"Error fetching categories: {e}")
         
         return None
     
-    def extract_historical_salary_data(self, country: str, job_type: str, months: int = 12) -> Optional[Dict]:
+    async def extract_historical_salary_data(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                             country: str, job_type: str, months: int = 12) -> Optional[Dict]:
         """Extract historical salary trends"""
         url = f"{self.settings.ADZUNA_BASE_URL}/jobs/{country}/history"
         
@@ -290,7 +581,7 @@ class AdzunaExtractor:
         }
         
         try:
-            response = self._make_request(url, params)
+            response = await self._make_request(session, semaphore, url, params)
             if response and 'month' in response:
                 return {
                     'job_type': job_type,
@@ -303,18 +594,61 @@ class AdzunaExtractor:
         
         return None
     
-    def _make_request(self, url: str, params: Dict) -> Optional[Dict]:
-        """Make HTTP request with retry logic"""
+    async def _with_session(self, fetch, *args):
+        """
+        Run fetch(session, semaphore, *args) on a pooled session bounded by
+        MAX_CONCURRENCY. The semaphore belongs to this session and its event
+        loop, so runs on other threads (iter_jobs) don't share or replace it
+        """
+        semaphore = asyncio.Semaphore(self.settings.MAX_CONCURRENCY)
+        # Nothing else deletes cache files; drop those past the longest TTL
+        await asyncio.to_thread(self.cache.prune, max(CACHE_TTLS.values()))
+        # One keep-alive pool for the whole run; DNS for api.adzuna.com is resolved once
+        connector = aiohttp.TCPConnector(
+            limit=self.settings.MAX_CONCURRENCY,
+            limit_per_host=self.settings.MAX_CONCURRENCY,
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            return await fetch(session, semaphore, *args)
+    
+    async def _make_request(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                            url: str, params: Dict) -> Optional[Dict]:
+        """Make HTTP request with retry logic, serving fresh responses from the cache"""
+        cache_key = self.cache.key(url, params)
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        
+        endpoint = url.split('/jobs/', 1)[1].split('/')[1]
+        
         for attempt in range(self.settings.MAX_RETRIES):
             try:
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                return response.json()
+                await self._limiter.acquire()
+                async with semaphore:
+                    async with session.get(url, params=params) as response:
+                        self._limiter.update(response.headers)
+                        if (response.status == 429 and 'Retry-After' in response.headers
+                                and attempt < self.settings.MAX_RETRIES - 1):
+                            # The limiter now holds every request until Retry-After; requeue this one
+                            self.logger.warning(f"Rate limited, retrying after {response.headers['Retry-After']}s")
+                            continue
+                        response.raise_for_status()
+                        body = json_loads(await response.read())
                 
-            except requests.exceptions.RequestException as e:
+                await asyncio.to_thread(
+                    self.cache.set, cache_key, body, CACHE_TTLS.get(endpoint, 60 * 60), response.status
+                )
+                return body
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 self.logger.warning(f"Request attempt {attempt + 1} failed: {e}")
-                if attempt < self.settings.MAX_RETRIES - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+                if retryable and attempt < self.settings.MAX_RETRIES - 1:
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     raise
         
@@ -347,40 +681,47 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     extractor = AdzunaExtractor()
     
-    # Extract comprehensive data
+    import pandas as pd
+    
+    # Create data directory
+    os.makedirs('data', exist_ok=True)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    jobs_file = f'data/comprehensive_job_data_{timestamp}.jsonl'
+    
+    # Extract comprehensive data; job listings are streamed straight to jobs_file
     data = extractor.extract_comprehensive_data(
         country="fr",
         locations=["paris", "ile de france"],
         job_types=["data engineer", "data scientist"],
-        max_pages=15
+        max_pages=15,
+        jobs_path=jobs_file
     )
     
     # Print data summary
     print(f"Extracted comprehensive data:")
-    print(f"- Jobs: {len(data['jobs'])}")
+    print(f"- Jobs: {data['extraction_metadata']['jobs_count']}")
     print(f"- Salary histograms: {len(data['salary_histograms'])}")
     print(f"- Top companies data: {len(data['top_companies'])}")
     print(f"- Geographic data: {len(data['geographic_data'])}")
-    print(f"- Categories: {len(data['categories'])}")
+    print(f"- Categories: {len(data['categories'] or [])}")
     
     # ========== NEW CODE TO SEE AND SAVE DATA ==========
     
-    import json
-    import pandas as pd
-    import os
-    
-    # Create data directory
-    os.makedirs('data', exist_ok=True)
-    
-    # 1. Save raw data as JSON
-    with open(f'data/comprehensive_job_data_{time.strftime("%Y%m%d_%H%M%S")}.json', 'w') as f:
-        json.dump(data, f, indent=2, default=str)
-    print(f"\n✅ Raw data saved to: data/comprehensive_job_data_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    # 1. Save the market data (everything but the jobs) as JSON
+    print(f"\n✅ Jobs saved to: {jobs_file}")
+    with open(f'data/comprehensive_market_data_{timestamp}.json', 'wb') as f:
+        if orjson is not None:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            f.write(json.dumps(data, indent=2).encode())
+    print(f"✅ Market data saved to: data/comprehensive_market_data_{timestamp}.json")
     
     # 2. Show sample job data
     print("\n📋 SAMPLE JOB DATA:")
-    if data['jobs']:
-        sample_job = data['jobs'][0]
+    with open(jobs_file, 'r') as f:
+        first_line = f.readline()
+    if first_line:
+        sample_job = json.loads(first_line)
         print(f"Title: {sample_job.get('title', 'N/A')}")
         print(f"Company: {sample_job.get('company_name', 'N/A')}")
         print(f"Location: {sample_job.get('location_display', 'N/A')}")
@@ -417,20 +758,22 @@ if __name__ == "__main__":
     # 6. Create quick analysis CSV files
     print("\n📊 CREATING ANALYSIS FILES:")
     
-    # Jobs DataFrame
-    jobs_df = pd.DataFrame(data['jobs'])
-    if not jobs_df.empty:
-        # Select key columns for analysis
-        analysis_columns = [
-            'title', 'company_name', 'location_display', 'salary_min', 'salary_max',
-            'category_label', 'contract_type', 'created', 'search_keyword', 'search_location'
-        ]
-        available_columns = [col for col in analysis_columns if col in jobs_df.columns]
-        jobs_analysis = jobs_df[available_columns]
-        jobs_analysis.to_csv(f'data/jobs_analysis_{time.strftime("%Y%m%d_%H%M%S")}.csv', index=False)
-        print(f"✅ Jobs analysis saved to: data/jobs_analysis_{time.strftime('%Y%m%d_%H%M%S')}.csv")
-        
-        # Basic statistics
+    # Jobs analysis CSV, written from the JSONL a chunk at a time
+    analysis_file = f'data/jobs_analysis_{timestamp}.csv'
+    analysis_columns = [
+        'title', 'company_name', 'location_display', 'salary_min', 'salary_max',
+        'category_label', 'contract_type', 'created', 'search_keyword', 'search_location'
+    ]
+    if data['extraction_metadata']['jobs_count']:
+        for i, chunk in enumerate(pd.read_json(jobs_file, lines=True, chunksize=1000)):
+            available_columns = [col for col in analysis_columns if col in chunk.columns]
+            chunk.reindex(columns=available_columns).to_csv(
+                analysis_file, mode='w' if i == 0 else 'a', header=i == 0, index=False
+            )
+        print(f"✅ Jobs analysis saved to: {analysis_file}")
+        
+        # Basic statistics, from the narrow analysis columns only
+        jobs_df = pd.read_csv(analysis_file)
         print(f"\n📈 QUICK INSIGHTS:")
         print(f"Unique companies: {jobs_df['company_name'].nunique() if 'company_name' in jobs_df else 'N/A'}")
         print(f"Unique locations: {jobs_df['location_display'].nunique() if 'location_display' in jobs_df else 'N/A'}")
@@ -438,15 +781,15 @@ if __name__ == "__main__":
         if 'salary_max' in jobs_df and jobs_df['salary_max'].notna().any():
             print(f"Avg max salary: ${jobs_df['salary_max'].mean():.0f}")
             print(f"Salary range: ${jobs_df['salary_max'].min():.0f} - ${jobs_df['salary_max'].max():.0f}")
-    
-    print(f"\n🎯 DATA AVAILABILITY INSIGHTS:")
-    print(f"Countries supported: US, GB, AU, CA, DE, FR, etc. (19 total)")
-    print(f"Your data covers: {len(set([job.get('search_location') for job in data['jobs']]))} locations")
-    print(f"Job types extracted: {len(set([job.get('search_keyword') for job in data['jobs']]))} types")
-    print(f"Categories available: {len(data['categories'])} categories")
+        
+        print(f"\n🎯 DATA AVAILABILITY INSIGHTS:")
+        print(f"Countries supported: US, GB, AU, CA, DE, FR, etc. (19 total)")
+        print(f"Your data covers: {jobs_df['search_location'].nunique() if 'search_location' in jobs_df else 0} locations")
+        print(f"Job types extracted: {jobs_df['search_keyword'].nunique() if 'search_keyword' in jobs_df else 0} types")
+    print(f"Categories available: {len(data['categories'] or [])} categories")
     
     print(f"\n💡 NEXT STEPS:")
-    print(f"1. Check data/jobs_analysis.csv for quick analysis")
-    print(f"2. Use comprehensive_job_data.json for full data")
+    print(f"1. Check {analysis_file} for quick analysis")
+    print(f"2. Use {jobs_file} for full job data")
     print(f"3. Run: python -m src.loaders.sqlite_loader to load into database")
-    print(f"4. Create Streamlit dashboard for visualization")
\ No newline at end of file
+    print(f"4. Create Streamlit dashboard for visualization")
@@ -1,11 +1,63 @@
 import sqlite3
-import pandas as pd
 import logging
 import json
-import glob
-from typing import List, Dict
+import os
+from datetime import datetime, timezone
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
-from config.settings import Settings
+from config.settings import get_settings
+
+try:
+    import orjson
+except ImportError:  # stdlib json parses the same files, only slower
+    orjson = None
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# raw_jobs columns written by the loader, in the order _rows_for_insert yields them
+INSERT_COLUMNS = [
+    'id', 'title', 'company', 'location', 'salary_min', 'salary_max',
+    'description', 'contract_type', 'category', 'created', 'redirect_url',
+    'search_location', 'search_keyword', 'extracted_at', 'raw_data'
+]
+# Columns that decide whether a re-extracted job actually changed; search_*,
+# extracted_at and raw_data differ on every run and are not compared
+CONTENT_COLUMNS = [
+    'title', 'company', 'location', 'salary_min', 'salary_max',
+    'description', 'contract_type', 'category', 'created', 'redirect_url'
+]
+# New jobs are inserted, changed ones rewritten in place and unchanged ones
+# skipped; {reset} clears derived columns so changed jobs are re-transformed
+UPSERT_SQL = f"""
+    INSERT INTO raw_jobs ({', '.join(INSERT_COLUMNS)})
+    VALUES ({', '.join('?' * len(INSERT_COLUMNS))})
+    ON CONFLICT(id) DO UPDATE SET
+        {', '.join(f'{col} = excluded.{col}' for col in INSERT_COLUMNS[1:])}{{reset}}
+    WHERE ({', '.join(f'raw_jobs.{col}' for col in CONTENT_COLUMNS)})
+        IS NOT ({', '.join(f'excluded.{col}' for col in CONTENT_COLUMNS)})
+"""
+
+
+def to_json(obj) -> str:
+    """JSON text for obj, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def to_timestamp(value) -> Optional[str]:
+    """ISO-8601 text as the 'YYYY-MM-DD HH:MM:SS' (UTC) SQLite stores; None if unparseable"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
 
 class SQLiteLoader:
     """
@@ -19,7 +71,7 @@ class SQLiteLoader:
     """
     
     def __init__(self):
-        self.settings = Settings()
+        self.settings = get_settings()
         self.db_path = Path(self.settings.DATABASE_PATH)
         self.logger = logging.getLogger(__name__)
         
@@ -30,31 +82,58 @@ class SQLiteLoader:
         self._initialize_database()
     
     def find_latest_data_file(self) -> str:
-        """Find the most recent comprehensive job data file"""
-        pattern = "data/comprehensive_job_data_*.json"
-        files = glob.glob(pattern)
+        """Find the most recent comprehensive job data file, preferring JSON lines"""
+        # One pass over data/, keeping the latest name (timestamp) per extension
+        latest = {'.jsonl': None, '.json': None}
+        with os.scandir('data') as entries:
+            for entry in entries:
+                if not entry.name.startswith('comprehensive_job_data_'):
+                    continue
+                for suffix, current in latest.items():
+                    if entry.name.endswith(suffix) and (current is None or entry.name > current.name):
+                        latest[suffix] = entry
         
-        if not files:
+        latest_entry = latest['.jsonl'] or latest['.json']
+        if latest_entry is None:
             raise FileNotFoundError("No comprehensive job data files found")
         
-        # Sort by filename (timestamp) to get the latest
-        latest_file = sorted(files)[-1]
-        self.logger.info(f"Using latest data file: {latest_file}")
-        return latest_file
+        self.logger.info(f"Using latest data file: {latest_entry.path}")
+        return latest_entry.path
+    
+    def iter_jobs(self, file_path: str) -> Iterator[Dict]:
+        """Yield jobs from a JSON lines file one at a time"""
+        with open(file_path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json_loads(line)
     
     def load_latest_data(self) -> Dict:
         """Load the most recent comprehensive job data"""
         latest_file = self.find_latest_data_file()
         
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
+        if latest_file.endswith('.jsonl'):
+            data = {'jobs': list(self.iter_jobs(latest_file))}
+        else:
+            with open(latest_file, 'rb') as f:
+                data = json_loads(f.read())
         
         self.logger.info(f"Loaded data from {latest_file}")
         return data
     
+    def _connect(self) -> sqlite3.Connection:
+        """Connection with the per-connection pragmas for bulk writes"""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        return conn
+    
     def _initialize_database(self):
         """Create database schema"""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._connect() as conn:
+            # WAL is persistent, so setting it once here covers every later connection
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             # Raw jobs table - stores data in normalized form
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS raw_jobs (
@@ -76,6 +155,14 @@ class SQLiteLoader:
                 )
             """)
             
+            # Covering partial index for get_job_stats: the aggregate reads this
+            # narrow index instead of table pages full of description/raw_data
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rj_stats
+                ON raw_jobs(created, company, location, salary_max)
+                WHERE salary_max > 0
+            """)
+            
             # Companies dimension table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS dim_companies (
@@ -101,7 +188,7 @@ class SQLiteLoader:
     
     def clear_database(self):
         """Clear all data from database"""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._connect() as conn:
             conn.execute("DELETE FROM raw_jobs")
             self.logger.info("Cleared existing data from database")
 
@@ -110,85 +197,84 @@ class SQLiteLoader:
         if not jobs:
             return 0
         
-        # Convert to DataFrame for easier handling
-        df = pd.DataFrame(jobs)
-        
-        # Clean and prepare data
-        df = self._clean_job_data(df)
+        return self.load_from_iterable(jobs)
+    
+    def load_from_iterable(self, jobs: Iterable[Dict], batch_size: int = 500) -> int:
+        """
+        Load jobs from any iterable, e.g. AdzunaExtractor.iter_jobs, without
+        materializing it: jobs are cleaned and written batch_size at a time,
+        all inside one transaction
+        """
+        seen_ids = set()
+        total_jobs = total_inserted = total_written = 0
+        jobs = iter(jobs)
         
-        with sqlite3.connect(str(self.db_path)) as conn:
-            # FIX: Use INSERT OR REPLACE to handle duplicates
-            chunk_size = 100
-            total_inserted = 0
+        with self._connect() as conn:
+            # Once the transformation columns exist, a changed job must go back
+            # through apply_transformations (it picks up skills_extracted IS NULL)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(raw_jobs)")}
+            upsert_sql = UPSERT_SQL.format(
+                reset=", skills_extracted = NULL" if 'skills_extracted' in columns else ""
+            )
             
-            for i in range(0, len(df), chunk_size):
-                chunk = df.iloc[i:i + chunk_size]
-                
-                # Use INSERT OR REPLACE strategy
-                chunk.to_sql('raw_jobs_temp', conn, if_exists='replace', index=False)
-                
-                # Insert with conflict resolution
-                conn.execute("""
-                    INSERT OR REPLACE INTO raw_jobs 
-                    SELECT * FROM raw_jobs_temp
-                """)
+            conn.execute("BEGIN")
+            rows_before = conn.execute("SELECT COUNT(*) FROM raw_jobs").fetchone()[0]
+            
+            while batch := list(islice(jobs, batch_size)):
+                total_jobs += len(batch)
                 
-                total_inserted += len(chunk)
+                # The same job comes back from overlapping searches; only the first
+                # copy is sent to the upsert (iter_jobs yields searches in a fixed
+                # order, so the same copy wins on every run)
+                unique_jobs = []
+                for job in batch:
+                    job_id = job.get('id')
+                    if job_id is None or job_id not in seen_ids:
+                        seen_ids.add(job_id)
+                        unique_jobs.append(job)
                 
-                if i % 500 == 0:
-                    self.logger.info(f"Processed {total_inserted} jobs so far...")
+                # rowcount counts inserted and updated rows, not skipped ones
+                total_written += conn.executemany(upsert_sql, self._rows_for_insert(unique_jobs)).rowcount
+                total_inserted += len(unique_jobs)
             
-            # Clean up temp table
-            conn.execute("DROP TABLE IF EXISTS raw_jobs_temp")
+            new_jobs = conn.execute("SELECT COUNT(*) FROM raw_jobs").fetchone()[0] - rows_before
+            conn.commit()
             
-            self.logger.info(f"Finished processing {total_inserted} jobs into raw_jobs table")
-            return total_inserted
-    
-    def _clean_job_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and standardize job data"""
-        # Map field names from extracted data to database schema
-        field_mapping = {
-            'company_name': 'company',  # Map extracted field to DB field
-            'location_display': 'location',
-            'category_label': 'category'
-        }
-        
-        # Apply field mapping
-        for extracted_field, db_field in field_mapping.items():
-            if extracted_field in df.columns:
-                df[db_field] = df[extracted_field]
+            # Refresh planner statistics for the new row counts
+            conn.execute("ANALYZE raw_jobs")
         
-        # Extract salary information
-        df['salary_min'] = df.get('salary_min', 0).fillna(0)
-        df['salary_max'] = df.get('salary_max', 0).fillna(0)
-        
-        # Parse dates
-        df['created'] = pd.to_datetime(df.get('created'), errors='coerce')
-        df['extracted_at'] = pd.to_datetime(df.get('extracted_at'))
-        
-        # Clean text fields
-        df['title'] = df.get('title', 'Unknown').fillna('Unknown')
-        df['company'] = df.get('company', 'Unknown').fillna('Unknown')
-        df['description'] = df.get('description', '').fillna('')
-        
-        # Store original data as JSON string
-        df['raw_data'] = df.to_json(orient='records')
-        
-        # Select only the columns we need
-        columns = [
-            'id', 'title', 'company', 'location', 'salary_min', 'salary_max',
-            'description', 'contract_type', 'category', 'created', 'redirect_url',
-            'search_location', 'search_keyword', 'extracted_at', 'raw_data'
-        ]
-        
-        # Only keep columns that exist in the DataFrame
-        available_columns = [col for col in columns if col in df.columns]
-        
-        return df[available_columns]
+        self.logger.info(f"Dropped {total_jobs - total_inserted} duplicate jobs of {total_jobs}")
+        self.logger.info(f"New: {new_jobs}, updated: {total_written - new_jobs}, "
+                         f"unchanged: {total_inserted - total_written}")
+        self.logger.info(f"Finished processing {total_inserted} jobs into raw_jobs table")
+        return total_inserted
+    
+    def _rows_for_insert(self, jobs: Iterable[Dict]) -> Iterator[Tuple]:
+        """Clean and standardize jobs into INSERT_COLUMNS-ordered tuples"""
+        for job in jobs:
+            yield (
+                job.get('id'),
+                job.get('title') or 'Unknown',
+                # Extracted fields map onto the flat DB fields
+                job.get('company_name') or 'Unknown',
+                job.get('location_display'),
+                job.get('salary_min') or 0,
+                job.get('salary_max') or 0,
+                job.get('description') or '',
+                job.get('contract_type'),
+                job.get('category_label'),
+                to_timestamp(job.get('created')),
+                job.get('redirect_url'),
+                job.get('search_location'),
+                job.get('search_keyword'),
+                to_timestamp(job.get('extracted_at')),
+                # Store the original job as a JSON string
+                to_json(job)
+            )
     
     def get_job_stats(self) -> Dict:
         """Get basic statistics about loaded data"""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT 
@@ -215,7 +301,7 @@ class SQLiteLoader:
         
     def add_transformation_columns(self):
         """Add columns for transformed data"""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._connect() as conn:
             try:
                 conn.execute("ALTER TABLE raw_jobs ADD COLUMN skills_extracted TEXT")
                 conn.execute("ALTER TABLE raw_jobs ADD COLUMN seniority_level VARCHAR")
@@ -240,11 +326,15 @@ if __name__ == "__main__":
     # Clear existing data first
     loader.clear_database()
 
-    # Load latest comprehensive data
-    data = loader.load_latest_data()
+    # Stream the latest JSON lines extract straight into the database
+    latest_file = loader.find_latest_data_file()
+    if latest_file.endswith('.jsonl'):
+        jobs = loader.iter_jobs(latest_file)
+    else:
+        jobs = loader.load_latest_data()['jobs']
     
     # Load jobs into database
-    jobs_loaded = loader.load_raw_jobs(data['jobs'])
+    jobs_loaded = loader.load_from_iterable(jobs)
     
     # Get statistics
     stats = loader.get_job_stats()